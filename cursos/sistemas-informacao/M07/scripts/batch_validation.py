@@ -0,0 +1,428 @@
+#!/usr/bin/env python3
+"""
+Validação em lote dos repositórios de uma turma
+Divide a lista em shards determinísticos (um por job da matrix), com checkpoint por repositório,
+e junta os resultados dos shards em um único relatório compatível com o post_slack.py
+"""
+
+import argparse
+import json
+import os
+import re
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+from shared.utils.duration_history import DurationHistory
+
+ENGINE_SCRIPT = Path(__file__).resolve().parent / "validation_engine.py"
+TEMPLATES_ROOT = Path(__file__).resolve().parents[4]
+REPO_TIMEOUT = 900
+
+# Duração estimada (segundos) de um repositório sem histórico
+DEFAULT_REPO_COST = 60.0
+
+# Arquivos de controle dentro da pasta de cada shard (os demais .json são checkpoints)
+MANIFEST_FILE = "manifest.json"
+HISTORY_FILE = "history.json"
+
+# Plano com a distribuição dos repositórios entre os shards, fixado uma vez por execução
+PLAN_FILE = "shard-plan.json"
+
+# Campos de cada repositório mantidos em memória no merge; os detalhes ficam só nos checkpoints
+SUMMARY_FIELDS = ('repo', 'location', 'status', 'summary', 'success_rate', 'summary_stats', 'config_name', 'config_sha256')
+
+def parse_repo_list(path):
+    """Lê a lista de repositórios: uma entrada por linha, `nome=caminho_ou_url` ou só o caminho/URL"""
+    entries = []
+    names = set()
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            name, _, location = line.partition("=") if "=" in line.split("://")[0] else ("", "", line)
+            if not name:
+                name = re.sub(r"\.git$", "", location.rstrip("/").rsplit("/", 1)[-1])
+            if name in names:
+                raise Exception(f"Repositório repetido na lista: {name}")
+            names.add(name)
+            entries.append({"name": name, "location": location})
+    return entries
+
+def estimate_repos(entries, history):
+    """Duração prevista de cada repositório pelo histórico (sem histórico, a mediana dos conhecidos)"""
+    known = sorted(s for s in (history.estimate("repos", e["name"]) for e in entries) if s is not None)
+    default = known[len(known) // 2] if known else DEFAULT_REPO_COST
+    return {e["name"]: history.estimate("repos", e["name"], default) for e in entries}
+
+def assign_shards(entries, shards, history=None):
+    """
+    Distribui os repositórios entre os shards, cada um do mais demorado para o mais rápido
+    Cada repositório, do mais demorado ao mais rápido, vai para o shard com menos carga prevista (LPT);
+    sem histórico, isso equivale a round-robin sobre a lista ordenada por nome
+    """
+    if shards < 1:
+        raise Exception(f"Número de shards inválido: {shards}")
+    estimates = estimate_repos(entries, history or DurationHistory())
+    ordered = sorted(entries, key=lambda e: (-estimates[e["name"]], e["name"]))
+
+    loads = [0.0] * shards
+    assigned = [[] for _ in range(shards)]
+    for entry in ordered:
+        target = min(range(shards), key=lambda i: (loads[i], i))
+        loads[target] += estimates[entry["name"]]
+        assigned[target].append(entry)
+    return assigned
+
+def shard_entries(entries, shards, index, history=None):
+    """Shard `index` (0..shards-1) da distribuição de `assign_shards`"""
+    if not 0 <= index < shards:
+        raise Exception(f"Shard inválido: {index} (de {shards})")
+    return assign_shards(entries, shards, history)[index]
+
+def load_plan(path, shards):
+    """Lê o plano gerado por `plan`: a lista de repositórios de cada shard"""
+    with open(path, "r", encoding="utf-8") as f:
+        plan = json.load(f)
+    if plan["shards"] != shards:
+        raise Exception(f"Plano feito para {plan['shards']} shards, não {shards}: {path}")
+    return plan["assignment"]
+
+def select_entries(entries, names):
+    """Entradas da lista de repositórios com os nomes dados, na ordem dos nomes"""
+    by_name = {entry["name"]: entry for entry in entries}
+    missing = [name for name in names if name not in by_name]
+    if missing:
+        raise Exception(f"Repositórios fora da lista: {', '.join(missing)}")
+    return [by_name[name] for name in names]
+
+def result_filename(name):
+    return re.sub(r"[^\w.-]", "_", name) + ".json"
+
+def write_json(path, data):
+    """Grava JSON de forma atômica, para que um job interrompido não deixe checkpoint pela metade"""
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path) or ".", suffix=".tmp")
+    with os.fdopen(fd, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2, ensure_ascii=False)
+    os.replace(tmp_path, path)
+
+def is_remote(location):
+    return "://" in location or location.startswith("git@") or location.endswith(".git")
+
+def checkout(entry, workdir):
+    """Devolve o caminho local do repositório, clonando (raso) se a entrada for uma URL"""
+    if not is_remote(entry["location"]):
+        return entry["location"]
+
+    target = os.path.join(workdir, re.sub(r"[^\w.-]", "_", entry["name"]))
+    if not os.path.isdir(target):
+        subprocess.run(
+            ["git", "clone", "--depth", "1", "--quiet", entry["location"], target],
+            check=True, capture_output=True, timeout=REPO_TIMEOUT
+        )
+    return target
+
+def validate_repository(entry, config_path, workdir, history_path=None):
+    """Valida um repositório em um processo separado, com o repositório como diretório atual"""
+    fd, results_path = tempfile.mkstemp(suffix=".json")
+    os.close(fd)
+    started = time.monotonic()
+    env = dict(os.environ)
+    env["VALIDATION_CONFIG"] = os.path.abspath(config_path)
+    env["RESULTS_FILE"] = results_path
+    # Teto para o prazo do motor abaixo do timeout do processo: o relatório parcial sai antes de o processo
+    # ser morto, e um `execution.timeout` menor continua valendo
+    cap = REPO_TIMEOUT - 60
+    if env.get("VALIDATION_MAX_TIMEOUT"):
+        cap = min(cap, float(env["VALIDATION_MAX_TIMEOUT"]))
+    env["VALIDATION_MAX_TIMEOUT"] = f"{cap:g}"
+    # O motor só lê o histórico de verificações; quem grava é o shard, ao final de cada repositório
+    if history_path:
+        env["VALIDATION_HISTORY"] = os.path.abspath(history_path)
+        env["VALIDATION_HISTORY_UPDATE"] = "0"
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [str(TEMPLATES_ROOT), env.get("PYTHONPATH")]))
+
+    try:
+        path = checkout(entry, workdir)
+        process = subprocess.run(
+            [sys.executable, str(ENGINE_SCRIPT)], cwd=path, env=env,
+            capture_output=True, text=True, timeout=REPO_TIMEOUT
+        )
+        with open(results_path, "r", encoding="utf-8") as f:
+            result = json.load(f)
+        result["exit_code"] = process.returncode
+    except Exception as e:
+        stderr = getattr(e, "stderr", None)
+        if isinstance(stderr, bytes):
+            stderr = stderr.decode("utf-8", errors="replace")
+        result = {
+            "status": "error",
+            "summary": f"Erro ao validar repositório: {e}" + (f" - {stderr.strip()[:200]}" if stderr else ""),
+            "success_rate": 0,
+            "details": []
+        }
+    finally:
+        os.remove(results_path)
+
+    result["repo"] = entry["name"]
+    result["location"] = entry["location"]
+    result["duration"] = round(time.monotonic() - started, 3)
+    return result
+
+def record_durations(history, result):
+    """Registra no histórico a duração do repositório e de cada verificação executada"""
+    if result.get("status") == "error":
+        return
+    history.record("repos", result["repo"], result["duration"])
+    for check_id, seconds in (result.get("schedule") or {}).get("durations", {}).items():
+        history.record("checks", check_id, seconds)
+
+def run_plan(args):
+    """Fixa a distribuição dos repositórios entre os shards, para todos os jobs (e tentativas) usarem a mesma"""
+    history = DurationHistory(args.history)
+    entries = parse_repo_list(args.repos)
+    estimates = estimate_repos(entries, history)
+    assignment = assign_shards(entries, args.shards, history)
+    write_json(args.output, {
+        "shards": args.shards,
+        "assignment": [[entry["name"] for entry in shard] for shard in assignment]
+    })
+    for index, shard in enumerate(assignment):
+        load = sum(estimates[entry["name"]] for entry in shard)
+        print(f"🧩 Shard {index + 1}/{args.shards}: {len(shard)} repositórios (~{load:.0f}s previstos)")
+    return 0
+
+def run_shard(args):
+    """Valida os repositórios de um shard, dos mais demorados aos mais rápidos, pulando os que já têm checkpoint"""
+    shard_dir = os.path.join(args.output_dir, f"shard-{args.index}")
+    os.makedirs(shard_dir, exist_ok=True)
+    entries = parse_repo_list(args.repos)
+    manifest_path = os.path.join(shard_dir, MANIFEST_FILE)
+
+    # A lista do shard não muda entre tentativas: vale o manifesto já gravado, depois o plano da execução;
+    # só sem os dois a distribuição é calculada aqui (e depende do histórico disponível)
+    if os.path.exists(manifest_path):
+        with open(manifest_path, "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+        if (manifest["shard"], manifest["shards"]) != (args.index, args.shards):
+            raise Exception(f"Manifesto de outro shard ({manifest['shard']} de {manifest['shards']}): {manifest_path}")
+        entries = select_entries(entries, manifest["repos"])
+    elif args.plan:
+        entries = select_entries(entries, load_plan(args.plan, args.shards)[args.index])
+    else:
+        entries = shard_entries(entries, args.shards, args.index, DurationHistory(args.history))
+    workdir = args.workdir or os.path.join(tempfile.gettempdir(), "batch-checkouts")
+    os.makedirs(workdir, exist_ok=True)
+
+    # O histórico do shard parte do histórico da turma e recebe as durações observadas aqui
+    shard_history_path = os.path.join(shard_dir, HISTORY_FILE)
+    if not os.path.exists(shard_history_path) and args.history and os.path.exists(args.history):
+        shutil.copyfile(args.history, shard_history_path)
+    shard_history = DurationHistory(shard_history_path)
+
+    if not os.path.exists(manifest_path):
+        write_json(manifest_path, {
+            "shard": args.index,
+            "shards": args.shards,
+            "repos": [entry["name"] for entry in entries]
+        })
+
+    print(f"🧩 Shard {args.index + 1}/{args.shards}: {len(entries)} repositórios")
+    pending = []
+    for entry in entries:
+        checkpoint = os.path.join(shard_dir, result_filename(entry["name"]))
+        if os.path.exists(checkpoint):
+            with open(checkpoint, "r", encoding="utf-8") as f:
+                previous = json.load(f)
+            # Erros de infraestrutura (clone, timeout) são tentados de novo
+            if previous.get("status") != "error":
+                print(f"⏩ {entry['name']}: já validado (checkpoint)")
+                continue
+        pending.append((entry, checkpoint))
+
+    # O pool pega as tarefas na ordem de envio: os repositórios mais demorados começam primeiro
+    with ThreadPoolExecutor(max_workers=max(1, args.workers)) as pool:
+        futures = {
+            pool.submit(validate_repository, entry, args.config, workdir, shard_history_path): checkpoint
+            for entry, checkpoint in pending
+        }
+        for future in as_completed(futures):
+            result = future.result()
+            write_json(futures[future], result)
+            record_durations(shard_history, result)
+            shard_history.save()
+            icon = "✅" if result.get("status") == "success" else "❌"
+            print(f"{icon} {result['repo']}: {result.get('summary', '')} ({result['duration']:.1f}s)")
+    return 0
+
+def merge_results(output_dir, plan=None):
+    """
+    Junta os checkpoints de todos os shards, em ordem de nome do repositório
+    Com o plano, também contam como faltando os repositórios de shards que nem gravaram manifesto
+    """
+    results = {}
+    expected = set()
+    if plan:
+        with open(plan, "r", encoding="utf-8") as f:
+            expected.update(name for shard in json.load(f)["assignment"] for name in shard)
+    for shard_dir in sorted(Path(output_dir).glob("shard-*")):
+        for path in sorted(shard_dir.glob("*.json")):
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if path.name == MANIFEST_FILE:
+                expected.update(data["repos"])
+            elif path.name != HISTORY_FILE:
+                results[data["repo"]] = {field: data[field] for field in SUMMARY_FIELDS if field in data}
+
+    missing = sorted(expected - set(results))
+    return [results[name] for name in sorted(results)], missing
+
+def build_merged_report(results, missing):
+    """Monta relatório consolidado da turma no formato esperado por slack_format.format_message"""
+    passed = sum(1 for r in results if r.get("status") == "success")
+    total = len(results) + len(missing)
+    success_rate = (passed / total * 100) if total else 0
+    config_name = next((r["config_name"] for r in results if r.get("config_name")), "Validação")
+
+    lines = []
+    lines.append("=" * 50)
+    lines.append("📊 RESUMO DAS VALIDAÇÕES")
+    lines.append("=" * 50)
+    lines.append(f"Repositórios: {total}")
+    lines.append(f"✅ Passou: {passed}")
+    lines.append(f"❌ Falhou: {total - passed - len(missing)}")
+    if missing:
+        lines.append(f"⏳ Sem resultado: {len(missing)}")
+    lines.append(f"📈 Taxa de sucesso: {success_rate:.1f}%")
+    lines.append("")
+    lines.append("-" * 50)
+    lines.append("📋 DETALHES")
+    lines.append("-" * 50)
+    for result in results:
+        icon = "✅" if result.get("status") == "success" else "❌"
+        lines.append(f"{icon} {result['repo']}: {result.get('summary', '')} ({result.get('success_rate', 0):.1f}%)")
+    for name in missing:
+        lines.append(f"⏳ {name}: shard não concluído")
+    lines.append("")
+    lines.append("=" * 50)
+
+    return {
+        "config_name": f"{config_name} - Turma",
+        "config_description": f"{total} repositórios validados em lote",
+        "summary": f"{passed}/{total} repositórios passaram",
+        "status": "success" if passed == total else "failed",
+        "success_rate": success_rate,
+        "detailed_report": "\n".join(lines),
+        "summary_stats": {
+            "total": total,
+            "passed": passed,
+            "failed": total - passed - len(missing),
+            "missing": len(missing),
+            "success_rate": success_rate
+        },
+        "repositories": [
+            {
+                "repo": r["repo"],
+                "status": r.get("status"),
+                "summary": r.get("summary"),
+                "success_rate": r.get("success_rate", 0),
+                "summary_stats": r.get("summary_stats", {})
+            }
+            for r in results
+        ],
+        "missing": missing
+    }
+
+def merge_history(output_dir, history_path):
+    """Junta os históricos dos shards no histórico da turma"""
+    history = DurationHistory(history_path)
+    for path in sorted(Path(output_dir).glob(f"shard-*/{HISTORY_FILE}")):
+        history.merge(DurationHistory(str(path)))
+    return history.save()
+
+def run_merge(args):
+    """Combina as saídas dos shards em um único results.json"""
+    if args.history:
+        merge_history(args.output_dir, args.history)
+    results, missing = merge_results(args.output_dir, args.plan)
+    report = build_merged_report(results, missing)
+    write_json(args.output, report)
+    print(report["detailed_report"])
+    return 0 if report["status"] == "success" else 1
+
+def run_local(args):
+    """Executa todos os shards como processos separados e depois junta os resultados"""
+    os.makedirs(args.output_dir, exist_ok=True)
+    args.plan = os.path.join(args.output_dir, PLAN_FILE)
+    plan_args = argparse.Namespace(repos=args.repos, shards=args.shards, history=args.history, output=args.plan)
+    run_plan(plan_args)
+
+    processes = []
+    for index in range(args.shards):
+        command = [
+            sys.executable, os.path.abspath(__file__), "shard",
+            "--repos", args.repos, "--config", args.config, "--output-dir", args.output_dir,
+            "--shards", str(args.shards), "--index", str(index), "--workers", str(args.workers),
+            "--plan", args.plan
+        ]
+        if args.history:
+            command += ["--history", args.history]
+        processes.append(subprocess.Popen(command))
+    for process in processes:
+        process.wait()
+    return run_merge(args)
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Validação em lote com shards")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    def add_common(subparser):
+        subparser.add_argument("--output-dir", default="batch-results", help="Pasta com os checkpoints dos shards")
+        subparser.add_argument("--history", default="batch-history.json", help="Histórico de durações da turma (vazio para não usar)")
+
+    plan = subparsers.add_parser("plan", help="Fixa a distribuição dos repositórios entre os shards")
+    add_common(plan)
+    plan.add_argument("--repos", required=True, help="Arquivo com a lista de repositórios")
+    plan.add_argument("--shards", type=int, default=1)
+    plan.add_argument("--output", default=PLAN_FILE, help="Arquivo JSON com o plano")
+
+    shard = subparsers.add_parser("shard", help="Valida um shard da lista de repositórios")
+    add_common(shard)
+    shard.add_argument("--repos", required=True, help="Arquivo com a lista de repositórios")
+    shard.add_argument("--config", default=os.environ.get("VALIDATION_CONFIG", "cursos/sistemas-informacao/M07/config/validation-config.yml"))
+    shard.add_argument("--shards", type=int, default=1)
+    shard.add_argument("--index", type=int, default=0, help="Índice do shard, a partir de 0")
+    shard.add_argument("--workdir", help="Pasta para clonar repositórios remotos")
+    shard.add_argument("--workers", type=int, default=1, help="Repositórios validados ao mesmo tempo no shard")
+    shard.add_argument("--plan", help="Plano gerado por `plan` (sem ele, a distribuição é calculada pelo histórico)")
+
+    merge = subparsers.add_parser("merge", help="Junta os resultados dos shards")
+    add_common(merge)
+    merge.add_argument("--output", default=os.environ.get("RESULTS_FILE", "results.json"))
+    merge.add_argument("--plan", help="Plano gerado por `plan`, para listar os repositórios de shards sem resultado")
+
+    local = subparsers.add_parser("local", help="Executa todos os shards localmente, em processos separados, e junta")
+    add_common(local)
+    local.add_argument("--repos", required=True)
+    local.add_argument("--config", default=os.environ.get("VALIDATION_CONFIG", "cursos/sistemas-informacao/M07/config/validation-config.yml"))
+    local.add_argument("--shards", type=int, default=2)
+    local.add_argument("--workers", type=int, default=1)
+    local.add_argument("--output", default=os.environ.get("RESULTS_FILE", "results.json"))
+
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    commands = {"plan": run_plan, "shard": run_shard, "merge": run_merge, "local": run_local}
+    try:
+        return commands[args.command](args)
+    except Exception as e:
+        print(f"❌ Erro na validação em lote: {e}")
+        return 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -3,104 +3,342 @@ Sistema de Validação Configurável
 Executa validações baseadas em arquivo de configuração YAML
 """
 
-import yaml
 import os
-import requests
+import re
+import posixpath
+import signal
+import socket
 import subprocess
+import threading
+import time
 import json
 from pathlib import Path
+from urllib.parse import unquote
 from shared.utils.file_checks import file_exists, folder_exists
+from shared.utils.config_loader import load_config, is_compiled_current, config_digest
+from shared.utils import http_client
+from shared.utils.check_graph import build_check_graph, normalize_path, CHECK_KEY_FIELDS
+from shared.utils.deadline import StageBudgets
+from shared.utils.check_result import CheckResult, to_json
+from shared.utils.duration_history import DurationHistory
+from shared.utils.scheduler import (
+    estimate_durations, upward_ranks, cheap_first_ranks, cheapest_first_ranks, critical_path, run_longest_first
+)
+from shared.utils.repo_scan import walk_files, file_sizes, find_duplicates, find_ignored, parse_size
+from shared.utils.ignore_rules import load_matcher, tracked_files
+from shared.utils.formatting import format_size
+from shared.utils.notebook_stream import scan_notebook
+from shared.utils.markdown_index import index_markdown, find_section
+
+# Seções do YAML e o tipo de verificação correspondente, na ordem de execução
+CHECK_STAGES = [
+    ('folders', 'folder'),
+    ('files', 'file'),
+    ('api_checks', 'api'),
+    ('custom_scripts', 'script'),
+    ('repository_checks', 'repository'),
+]
+
+# Timeout padrão de cada operação, em segundos (limitado pelo tempo restante do prazo)
+API_TIMEOUT = 10
+SCRIPT_TIMEOUT = 60
+
+# Validações avaliadas sobre o resumo do notebook, sem ler o arquivo inteiro
+NOTEBOOK_VALIDATIONS = {
+    'min_code_cells',
+    'min_markdown_cells',
+    'executed_in_order',
+    'no_error_outputs',
+    'max_output_size',
+}
+
+# Validações avaliadas sobre o índice de títulos/seções do Markdown
+MARKDOWN_VALIDATIONS = {
+    'min_headings',
+    'required_sections',
+    'min_section_length',
+    'no_broken_links',
+    'no_missing_images',
+}
+
+MARKDOWN_EXTENSIONS = ('.md', '.markdown')
+
+# Links com esquema (http:, mailto:...) ou protocolo relativo não são verificados
+EXTERNAL_LINK = re.compile(r'^(?:[a-z][a-z0-9+.-]*:|//)', re.IGNORECASE)
 
 class ValidationEngine:
-    def __init__(self, config_path):
+    def __init__(self, config_path, fail_fast=None, timeout=None, workers=None, history_path=None, update_history=True,
+                 max_timeout=None):
         """Inicializa o motor de validação com arquivo de configuração"""
         self.config_path = config_path
         self.config = self.load_config()
+        self.config_sha256 = config_digest(self.config)
         self.results = []
+        execution = self.config.get('execution', {}) or {}
+        self.fail_fast = execution.get('fail_fast', False) if fail_fast is None else fail_fast
+        self.ignore_patterns = execution.get('ignore')
+        # Prazo global (segundos) e orçamentos por tipo de verificação, contados a partir daqui;
+        # `max_timeout` só limita o prazo configurado (não o substitui)
+        total = execution.get('timeout') if timeout is None else timeout
+        if max_timeout is not None:
+            total = max_timeout if total is None else min(total, max_timeout)
+        self.budgets = StageBudgets(total, execution.get('stage_timeouts'))
+        # Verificações independentes rodam em paralelo, as mais longas primeiro (pelo histórico de durações)
+        self.workers = int(execution.get('workers', 1) if workers is None else workers)
+        self.history = DurationHistory(history_path or execution.get('history'))
+        self.update_history = update_history
+        self.predicted_durations = {}
+        self.durations = {}
+        self.completed = {}
+        self._running_processes = {}
+        # Verificações em andamento (id → thread), para o fail-fast interromper as que já começaram
+        self._running_checks = {}
+        self._cancelled = set()
+        self._cancelled_owners = set()
+        # Threads cuja verificação atual foi interrompida pelo prazo, e as verificações que terminaram assim
+        self._deadline_owners = set()
+        self._timed_out_checks = set()
+        self._cache_lock = threading.RLock()
+        self.check_graph = build_check_graph(self.config, CHECK_STAGES)
+        self.check_status = {}
+        self.stop_reason = None
+        self._repository_files = None
+        self._tracked_files = False
+        self._markdown_indexes = {}
+        self._existing_paths = {}
+        self.check_runners = {
+            'folder': self.check_folder,
+            'file': self.check_file,
+            'api': self.check_api,
+            'script': self.check_script,
+            'repository': self.check_repository,
+        }
         
     def load_config(self):
-        """Carrega configuração do arquivo YAML"""
+        """Carrega configuração do arquivo YAML (ou da versão JSON pré-compilada)"""
         try:
-            with open(self.config_path, 'r', encoding='utf-8') as file:
-                return yaml.safe_load(file)
+            return load_config(self.config_path)
         except Exception as e:
             raise Exception(f"Erro ao carregar configuração: {e}")
     
     def validate_folders(self):
         """Valida existência de pastas"""
-        if 'folders' not in self.config.get('validations', {}):
-            return
-            
-        for folder in self.config['validations']['folders']:
-            path = folder['path']
-            required = folder.get('required', True)
-            description = folder.get('description', f'Pasta {path}')
-            
-            exists = folder_exists(path)
-            
-            result = {
-                'type': 'folder',
-                'path': path,
-                'description': description,
-                'required': required,
-                'passed': exists or not required,
-                'exists': exists,
-                'message': f"✅ {description}" if exists else f"❌ {description} não encontrada"
-            }
-            
-            self.results.append(result)
+        self.run_checks('folder')
     
     def validate_files(self):
         """Valida existência e conteúdo de arquivos"""
-        if 'files' not in self.config.get('validations', {}):
-            return
-            
-        for file_config in self.config['validations']['files']:
-            path = file_config['path']
-            required = file_config.get('required', True)
-            description = file_config.get('description', f'Arquivo {path}')
-            
-            exists = file_exists(path)
-            
-            # Resultado base
-            result = {
-                'type': 'file',
-                'path': path,
-                'description': description,
-                'required': required,
-                'exists': exists,
-                'validations': []
-            }
-            
-            # Se arquivo existe, executa validações de conteúdo
-            if exists and 'validations' in file_config:
-                self.validate_file_content(path, file_config['validations'], result)
-            
-            # Determina se passou na validação
-            content_validations_passed = all(v['passed'] for v in result['validations'])
-            result['passed'] = (exists or not required) and content_validations_passed
-            result['message'] = f"✅ {description}" if result['passed'] else f"❌ {description} falhou na validação"
-            
-            self.results.append(result)
+        self.run_checks('file')
+    
+    def check_folder(self, folder):
+        """Verifica existência de uma pasta"""
+        path = folder['path']
+        required = folder.get('required', True)
+        description = folder.get('description', f'Pasta {path}')
+        
+        exists = folder_exists(path)
+        
+        result = CheckResult(
+            'folder', path, description, required,
+            passed=exists or not required,
+            status='ok' if exists else 'failed',
+            note='' if exists else " não encontrada",
+            exists=exists
+        )
+        
+        # Validações de Markdown aplicadas a todos os documentos da pasta
+        if exists and 'validations' in folder:
+            result.validations = []
+            self.validate_folder_content(path, folder['validations'], result)
+            if not all(v['passed'] for v in result.validations):
+                result.fail(" falhou na validação")
+        
+        return result
+    
+    def check_file(self, file_config):
+        """Verifica existência e conteúdo de um arquivo"""
+        path = file_config['path']
+        required = file_config.get('required', True)
+        description = file_config.get('description', f'Arquivo {path}')
+        
+        exists = file_exists(path)
+        
+        # Resultado base
+        result = CheckResult('file', path, description, required, passed=False, status='failed', exists=exists, validations=[])
+        
+        # Se arquivo existe, executa validações de conteúdo
+        if exists and 'validations' in file_config:
+            self.validate_file_content(path, file_config['validations'], result)
+        
+        # Determina se passou na validação
+        content_validations_passed = all(v['passed'] for v in result.validations)
+        result.passed = (exists or not required) and content_validations_passed
+        result.status = 'ok' if exists and content_validations_passed else 'failed'
+        result.icon = '✅' if result.passed else '❌'
+        result.note = '' if result.passed else " falhou na validação"
+        
+        return result
     
     def validate_file_content(self, file_path, validations, result):
         """Valida conteúdo específico do arquivo"""
+        content = None
+        notebook = None
         try:
-            with open(file_path, 'r', encoding='utf-8') as file:
-                content = file.read()
-                lines = content.split('\n')
-                
             for validation in validations:
-                validation_result = self.execute_content_validation(content, lines, validation)
-                result['validations'].append(validation_result)
+                # Notebooks são lidos de forma incremental, uma única vez
+                if validation['type'] in NOTEBOOK_VALIDATIONS:
+                    if notebook is None:
+                        notebook = scan_notebook(file_path)
+                    validation_result = self.execute_notebook_validation(notebook, validation)
+                elif validation['type'] in MARKDOWN_VALIDATIONS:
+                    validation_result = self.execute_markdown_validation(self.markdown_index(file_path), validation, file_path)
+                else:
+                    if content is None:
+                        with open(file_path, 'r', encoding='utf-8') as file:
+                            content = file.read()
+                            lines = content.split('\n')
+                    validation_result = self.execute_content_validation(content, lines, validation)
+                result.validations.append(validation_result)
                 
         except Exception as e:
-            result['validations'].append({
+            result.validations.append({
                 'type': 'error',
                 'passed': False,
                 'message': f"Erro ao ler arquivo: {e}"
             })
     
+    def validate_folder_content(self, folder_path, validations, result):
+        """Aplica validações de Markdown a cada documento da pasta, lendo cada arquivo uma única vez"""
+        try:
+            matcher = load_matcher('.', self.ignore_patterns)
+            documents = [
+                path for path, _ in walk_files(folder_path, matcher, prefix=folder_path)
+                if path.lower().endswith(MARKDOWN_EXTENSIONS)
+            ]
+            
+            for validation in validations:
+                validation_type = validation['type']
+                description = validation.get('description', f'Validação {validation_type}')
+                failures = []
+                for path in documents:
+                    document_result = self.execute_markdown_validation(self.markdown_index(path), validation, path)
+                    if not document_result['passed']:
+                        failures.append(f"{path}: {'; '.join(document_result['details'][:2])}")
+                
+                passed = not failures
+                message = f"✅ {description} ({len(documents)} arquivos)" if passed else f"❌ {description} ({len(failures)}/{len(documents)} arquivos - {' | '.join(failures[:3])})"
+                result.validations.append({
+                    'type': validation_type,
+                    'expected': validation.get('value'),
+                    'passed': passed,
+                    'message': message,
+                    'description': description,
+                    'details': failures
+                })
+                
+        except Exception as e:
+            result.validations.append({
+                'type': 'error',
+                'passed': False,
+                'message': f"Erro ao ler documentos: {e}"
+            })
+    
+    def markdown_index(self, path):
+        """Índice de títulos, seções, links e imagens do Markdown, calculado uma vez por arquivo"""
+        path = normalize_path(path)
+        if path not in self._markdown_indexes:
+            with open(path, 'r', encoding='utf-8') as file:
+                self._markdown_indexes[path] = index_markdown(file.read())
+        return self._markdown_indexes[path]
+    
+    def path_exists(self, path):
+        """os.path.exists com cache, já que muitos documentos apontam para os mesmos arquivos"""
+        if path not in self._existing_paths:
+            self._existing_paths[path] = os.path.exists(path)
+        return self._existing_paths[path]
+    
+    def broken_references(self, file_path, references):
+        """Lista links/imagens relativos cujo destino (ou âncora) não existe no repositório"""
+        broken = []
+        file_path = normalize_path(file_path)
+        for reference in references:
+            target = reference['target']
+            if not target or EXTERNAL_LINK.match(target):
+                continue
+            
+            target_path, _, anchor = target.partition('#')
+            target_path = unquote(target_path.split('?')[0])
+            if target_path.startswith('/'):
+                resolved = normalize_path(target_path.lstrip('/'))
+            elif target_path:
+                resolved = normalize_path(posixpath.join(posixpath.dirname(file_path), target_path))
+            else:
+                resolved = file_path
+            # Links para a raiz do repositório (`../` a partir de docs/, `./` no README raiz) normalizam para ''
+            resolved = resolved or '.'
+            
+            if not self.path_exists(resolved):
+                broken.append(f"linha {reference['line']} → {target}")
+            elif anchor and resolved.lower().endswith(MARKDOWN_EXTENSIONS) and os.path.isfile(resolved):
+                slugs = {heading['slug'] for heading in self.markdown_index(resolved)['headings']}
+                if unquote(anchor).lower() not in slugs:
+                    broken.append(f"linha {reference['line']} → {target} (âncora inexistente)")
+        return broken
+    
+    def execute_markdown_validation(self, index, validation, file_path):
+        """Executa validação sobre o índice estrutural de um Markdown"""
+        validation_type = validation['type']
+        expected_value = validation.get('value')
+        description = validation.get('description', f'Validação {validation_type}')
+        details = []
+        
+        if validation_type == 'min_headings':
+            actual = len(index['headings'])
+            passed = actual >= expected_value
+            details = [f"{actual}/{expected_value} títulos"]
+            message = f"✅ {description} ({actual} títulos)" if passed else f"❌ {description} ({actual}/{expected_value} títulos)"
+            
+        elif validation_type == 'required_sections':
+            sections = expected_value if isinstance(expected_value, list) else [expected_value]
+            missing = [section for section in sections if find_section(index, section) is None]
+            passed = not missing
+            details = [f"faltando {section}" for section in missing]
+            message = f"✅ {description}" if passed else f"❌ {description} (faltando: {', '.join(missing)})"
+            
+        elif validation_type == 'min_section_length':
+            section_title = validation['section']
+            unit = validation.get('unit', 'words')
+            unit_name = 'linhas' if unit == 'lines' else 'palavras'
+            section = find_section(index, section_title)
+            if section is None:
+                passed = False
+                details = [f"seção {section_title} não encontrada"]
+                message = f"❌ {description} (seção {section_title} não encontrada)"
+            else:
+                actual = section[unit]
+                passed = actual >= expected_value
+                details = [f"{section_title}: {actual}/{expected_value} {unit_name}"]
+                message = f"✅ {description} ({actual} {unit_name})" if passed else f"❌ {description} ({actual}/{expected_value} {unit_name})"
+                
+        elif validation_type in ('no_broken_links', 'no_missing_images'):
+            references = index['links'] if validation_type == 'no_broken_links' else index['images']
+            details = self.broken_references(file_path, references)
+            passed = not details
+            kind = 'links quebrados' if validation_type == 'no_broken_links' else 'imagens ausentes'
+            message = f"✅ {description}" if passed else f"❌ {description} ({len(details)} {kind}: {', '.join(details[:3])})"
+            
+        else:
+            passed = False
+            message = f"❌ Tipo de validação desconhecido: {validation_type}"
+        
+        return {
+            'type': validation_type,
+            'expected': expected_value,
+            'passed': passed,
+            'message': message,
+            'description': description,
+            'details': details
+        }
+    
     def execute_content_validation(self, content, lines, validation):
         """Executa validação específica de conteúdo"""
         validation_type = validation['type']
@@ -133,105 +371,444 @@ class ValidationEngine:
             'description': description
         }
     
-    def validate_api_endpoints(self):
-        """Valida endpoints de API"""
-        if 'api_checks' not in self.config.get('validations', {}):
-            return
+    def execute_notebook_validation(self, notebook, validation):
+        """Executa validação sobre o resumo de um notebook Jupyter"""
+        validation_type = validation['type']
+        expected_value = validation.get('value', True)
+        description = validation.get('description', f'Validação {validation_type}')
+        
+        if validation_type in ('min_code_cells', 'min_markdown_cells'):
+            actual = notebook['code_cells' if validation_type == 'min_code_cells' else 'markdown_cells']
+            passed = actual >= expected_value
+            message = f"✅ {description} ({actual} células)" if passed else f"❌ {description} ({actual}/{expected_value} células)"
             
-        for api_check in self.config['validations']['api_checks']:
-            url = api_check['url']
-            method = api_check.get('method', 'GET')
-            required = api_check.get('required', True)
-            expected_status = api_check.get('expected_status', 200)
-            description = api_check.get('description', f'API {url}')
+        elif validation_type == 'executed_in_order':
+            pending = notebook['unexecuted_cells'] + notebook['out_of_order_cells']
+            passed = pending == 0 or not expected_value
+            message = f"✅ {description}" if passed else f"❌ {description} ({notebook['unexecuted_cells']} não executadas, {notebook['out_of_order_cells']} fora de ordem)"
             
-            try:
-                response = requests.request(method, url, timeout=10)
-                passed = response.status_code == expected_status
-                message = f"✅ {description} ({response.status_code})" if passed else f"❌ {description} ({response.status_code}/{expected_status})"
-                
-            except Exception as e:
-                passed = False
-                message = f"❌ {description} - Erro: {str(e)}"
+        elif validation_type == 'no_error_outputs':
+            passed = notebook['error_outputs'] == 0 or not expected_value
+            names = ", ".join(n for n in notebook['error_names'] if n)
+            message = f"✅ {description}" if passed else f"❌ {description} ({notebook['error_outputs']} erros: {names})"
             
-            result = {
-                'type': 'api',
-                'url': url,
-                'method': method,
-                'description': description,
-                'required': required,
-                'passed': passed or not required,
-                'message': message
-            }
+        elif validation_type == 'max_output_size':
+            limit = parse_size(expected_value)
+            actual = notebook['output_size']
+            passed = actual <= limit
+            message = f"✅ {description} ({format_size(actual)})" if passed else f"❌ {description} ({format_size(actual)}/{format_size(limit)})"
             
-            self.results.append(result)
+        else:
+            passed = False
+            message = f"❌ Tipo de validação desconhecido: {validation_type}"
+        
+        return {
+            'type': validation_type,
+            'expected': expected_value,
+            'passed': passed,
+            'message': message,
+            'description': description
+        }
+    
+    def validate_api_endpoints(self):
+        """Valida endpoints de API"""
+        self.run_checks('api')
     
     def run_custom_scripts(self):
         """Executa scripts personalizados"""
-        if 'custom_scripts' not in self.config.get('validations', {}):
-            return
+        self.run_checks('script')
+    
+    def check_api(self, api_check):
+        """Verifica um endpoint de API"""
+        url = api_check['url']
+        method = api_check.get('method', 'GET')
+        required = api_check.get('required', True)
+        expected_status = api_check.get('expected_status', 200)
+        description = api_check.get('description', f'API {url}')
+        
+        timeout = self.budgets.timeout('api', API_TIMEOUT)
+        try:
+            if threading.get_ident() in self._cancelled_owners:
+                raise Exception("verificação cancelada")
+            response = http_client.request(method, url, timeout=timeout)
+            passed = response.status_code == expected_status
+            note = f" ({response.status_code})" if passed else f" ({response.status_code}/{expected_status})"
+            
+        except socket.timeout as e:
+            passed = False
+            note = f" - Erro: {str(e)}"
+            self.mark_deadline_hit(timeout, API_TIMEOUT)
+        except Exception as e:
+            passed = False
+            note = f" - Erro: {str(e)}"
+        
+        return CheckResult(
+            'api', url, description, required,
+            passed=passed or not required,
+            status='ok' if passed else 'failed',
+            note=note,
+            method=method
+        )
+    
+    def check_script(self, script_config):
+        """Executa um script personalizado"""
+        name = script_config['name']
+        script = script_config['script']
+        required = script_config.get('required', True)
+        description = script_config.get('description', f'Script {name}')
+        
+        timeout = self.budgets.timeout('script', SCRIPT_TIMEOUT)
+        try:
+            returncode, stderr = self.run_process(script, timeout)
+            passed = returncode == 0
+            note = f" - Erro: {stderr[:100]}" if stderr else ''
             
-        for script_config in self.config['validations']['custom_scripts']:
-            name = script_config['name']
-            script = script_config['script']
-            required = script_config.get('required', True)
-            description = script_config.get('description', f'Script {name}')
+        except subprocess.TimeoutExpired:
+            passed = False
+            note = " - Timeout"
+            self.mark_deadline_hit(timeout, SCRIPT_TIMEOUT)
+        except Exception as e:
+            passed = False
+            note = f" - Erro: {str(e)}"
+        
+        return CheckResult(
+            'script', name, description, required,
+            passed=passed or not required,
+            status='ok' if passed else 'failed',
+            note=note,
+            script=script
+        )
+    
+    def run_process(self, script, timeout):
+        """Executa um comando em um grupo de processos próprio, para poder encerrar também os filhos"""
+        process = subprocess.Popen(
+            script, shell=True, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True,
+            start_new_session=True
+        )
+        owner = threading.get_ident()
+        self._running_processes[owner] = process
+        # Cancelamento pedido antes de o processo existir
+        if owner in self._cancelled_owners:
+            self.kill_process(process)
+        try:
+            _, stderr = process.communicate(timeout=timeout)
+        except subprocess.TimeoutExpired:
+            self.kill_process(process)
+            process.communicate()
+            raise
+        finally:
+            self._running_processes.pop(owner, None)
+        return process.returncode, stderr
+    
+    def kill_process(self, process):
+        """Encerra o processo e todo o seu grupo"""
+        try:
+            os.killpg(process.pid, signal.SIGKILL)
+        except (AttributeError, ProcessLookupError, PermissionError):
+            process.kill()
+    
+    def mark_deadline_hit(self, timeout, default):
+        """Marca a verificação da thread atual como interrompida pelo prazo quando o timeout estourado era o reduzido"""
+        if timeout < default:
+            self._deadline_owners.add(threading.get_ident())
+    
+    def expire_running(self, owner):
+        """Watchdog do prazo: marca a verificação da thread `owner` como interrompida pelo tempo e a cancela"""
+        self._deadline_owners.add(owner)
+        self.cancel_running(owner)
+    
+    def cancel_running(self, owner):
+        """Interrompe a verificação em andamento na thread `owner`: requisições HTTP abertas e o script em execução"""
+        self._cancelled_owners.add(owner)
+        http_client.close_all(owner)
+        process = self._running_processes.get(owner)
+        if process is not None and process.poll() is None:
+            self.kill_process(process)
+    
+    def validate_repository(self):
+        """Valida tamanho do repositório, arquivos grandes e duplicados"""
+        self.run_checks('repository')
+    
+    def tracked_files(self):
+        """Arquivos versionados no git (None fora de um repositório git)"""
+        with self._cache_lock:
+            if self._tracked_files is False:
+                self._tracked_files = tracked_files('.')
+        return self._tracked_files
+    
+    def repository_files(self):
+        """
+        Lista (caminho, tamanho) dos arquivos do repositório, uma única vez por execução
+        Usa os arquivos versionados quando possível; senão varre a árvore podando pastas ignoradas
+        """
+        with self._cache_lock:
+            if self._repository_files is None:
+                tracked = self.tracked_files()
+                if tracked is not None:
+                    self._repository_files = file_sizes(tracked)
+                else:
+                    self._repository_files = walk_files('.', load_matcher('.', self.ignore_patterns))
+        return self._repository_files
+    
+    def committed_ignored_files(self, extra_patterns=None):
+        """Entradas versionadas que as regras de ignore cobrem, agrupadas pela pasta ignorada mais externa"""
+        matcher = load_matcher('.', self.ignore_patterns).add_patterns(extra_patterns or [])
+        tracked = self.tracked_files()
+        if tracked is None:
+            return find_ignored('.', matcher)
+        
+        found = {}
+        for path in tracked:
+            parent = matcher.ignored_parent(path)
+            if parent:
+                found[f"{parent}/"] = found.get(f"{parent}/", 0) + 1
+            elif matcher.matches(path):
+                found[path] = 1
+        return [{'path': path, 'files': count} for path, count in sorted(found.items())]
+    
+    def check_repository(self, repo_check):
+        """Executa uma verificação sobre o repositório como um todo"""
+        check_type = repo_check['type']
+        required = repo_check.get('required', True)
+        description = repo_check.get('description', f'Verificação {check_type}')
+        details = []
+        
+        try:
+            files = self.repository_files()
             
-            try:
-                result = subprocess.run(script, shell=True, capture_output=True, text=True, timeout=60)
-                passed = result.returncode == 0
+            if check_type == 'max_repo_size':
+                limit = parse_size(repo_check['value'])
+                total = sum(size for _, size in files)
+                passed = total <= limit
+                note = f" ({format_size(total)})" if passed else f" ({format_size(total)}/{format_size(limit)})"
                 
-                message = f"✅ {description}" if passed else f"❌ {description}"
-                if result.stderr:
-                    message += f" - Erro: {result.stderr[:100]}"
+            elif check_type == 'max_file_size':
+                limit = parse_size(repo_check['value'])
+                large_files = sorted((f for f in files if f[1] > limit), key=lambda f: (-f[1], f[0]))
+                details = [{'path': path, 'size': size} for path, size in large_files]
+                passed = not large_files
+                examples = ", ".join(f"{path} ({format_size(size)})" for path, size in large_files[:3])
+                note = '' if passed else f" ({len(large_files)} acima de {format_size(limit)}: {examples})"
                 
-            except subprocess.TimeoutExpired:
-                passed = False
-                message = f"❌ {description} - Timeout"
-            except Exception as e:
+            elif check_type == 'no_duplicate_files':
+                min_size = parse_size(repo_check.get('min_size', 1))
+                details = find_duplicates(files, '.', min_size, repo_check.get('workers'))
+                passed = not details
+                wasted = sum(d['size'] * (len(d['files']) - 1) for d in details)
+                examples = "; ".join(" = ".join(d['files'][:3]) for d in details[:2])
+                note = '' if passed else f" ({len(details)} grupos, {format_size(wasted)} repetidos: {examples})"
+                
+            elif check_type == 'no_ignored_files':
+                details = self.committed_ignored_files(repo_check.get('patterns'))
+                passed = not details
+                examples = ", ".join(
+                    f"{d['path']} ({d['files']} arquivos)" if d['files'] and d['files'] > 1 else d['path']
+                    for d in details[:5]
+                )
+                note = '' if passed else f" ({len(details)} entradas: {examples})"
+                
+            else:
                 passed = False
-                message = f"❌ {description} - Erro: {str(e)}"
-            
-            result = {
-                'type': 'script',
-                'name': name,
-                'script': script,
-                'description': description,
-                'required': required,
-                'passed': passed or not required,
-                'message': message
-            }
-            
-            self.results.append(result)
+                note = f" - tipo de verificação desconhecido: {check_type}"
+                
+        except Exception as e:
+            passed = False
+            note = f" - Erro: {str(e)}"
+        
+        return CheckResult(
+            'repository', check_type, description, required,
+            passed=passed or not required,
+            status='ok' if passed else 'failed',
+            note=note,
+            details=details,
+            expected=repo_check.get('value')
+        )
+    
+    def skipped_result(self, node, reason, status='skipped'):
+        """Monta resultado de uma verificação que não foi executada (ou não terminou, com status timed_out)"""
+        config = node['config']
+        required = config.get('required', True)
+        description = config.get('description', node['id'])
+        note = f" - tempo esgotado: {reason}" if status == 'timed_out' else f" - ignorada: {reason}"
+        
+        extra = {field: config[field] for field in ('method', 'script') if field in config}
+        result = CheckResult(
+            node['type'], config.get(CHECK_KEY_FIELDS[node['type']]), description, required,
+            passed=not required, status=status, note=note, skip_reason=reason, **extra
+        )
+        result.id = node['id']
+        return result
+    
+    def blocking_dependency(self, node):
+        """Retorna o pré-requisito que impede a execução da verificação, se houver"""
+        for required_id in node['requires']:
+            status = self.check_status.get(required_id)
+            if status is not None and not status['satisfied']:
+                # Aponta para a causa raiz quando o pré-requisito também foi ignorado
+                return status.get('blocked_by') or required_id
+        return None
+    
+    def execute_with_deadline(self, node):
+        """Executa a verificação (em uma thread do pool) com um watchdog que a interrompe quando o tempo da etapa acaba"""
+        owner = threading.get_ident()
+        self._cancelled_owners.discard(owner)
+        self._deadline_owners.discard(owner)
+        # Registra antes de conferir o fail-fast: ou a falha já aconteceu, ou quem a registrar cancela esta verificação
+        self._running_checks[node['id']] = owner
+        if self.stop_reason:
+            self._running_checks.pop(node['id'], None)
+            return self.skipped_result(node, self.stop_reason)
+        
+        remaining = self.budgets.remaining(node['type'])
+        watchdog = threading.Timer(remaining, self.expire_running, [owner]) if remaining is not None else None
+        if watchdog:
+            watchdog.daemon = True
+            watchdog.start()
+        
+        started = time.monotonic()
+        try:
+            result = self.check_runners[node['type']](node['config'])
+        finally:
+            self._running_checks.pop(node['id'], None)
+            if watchdog:
+                watchdog.cancel()
+            self.durations[node['id']] = time.monotonic() - started
+            # Quem interrompeu é registrado aqui: recalcular pelo orçamento depois é impreciso (a medição começa após o watchdog)
+            if owner in self._deadline_owners:
+                self._timed_out_checks.add(node['id'])
+        result.id = node['id']
+        return result
+    
+    def prepare_check(self, node):
+        """Resultado de uma verificação que não deve rodar (tempo esgotado, fail-fast ou pré-requisito falho); None se deve"""
+        if self.budgets.exhausted(node['type']):
+            return self.skipped_result(node, self.budgets.reason(node['type']), status='timed_out')
+        if self.stop_reason:
+            return self.skipped_result(node, self.stop_reason)
+        blocked_by = self.blocking_dependency(node)
+        if blocked_by:
+            return self.skipped_result(node, f"depende de {blocked_by}, que falhou")
+        return None
+    
+    def record_result(self, node, result):
+        """Registra o resultado de uma verificação (sempre na thread principal)"""
+        check_type = node['type']
+        if node['id'] in self.durations:
+            self.budgets.charge(check_type, self.durations[node['id']])
+            # Falha causada pela interrupção (ou pelo timeout reduzido) conta como tempo esgotado
+            if result.status != 'ok' and (node['id'] in self._timed_out_checks or self.budgets.exhausted(check_type)):
+                result = self.skipped_result(node, self.budgets.reason(check_type), status='timed_out')
+            # Falha causada pelo cancelamento do fail-fast conta como ignorada, não como nova falha
+            elif result.status != 'ok' and node['id'] in self._cancelled:
+                result = self.skipped_result(node, f"interrompida por {self.stop_reason}")
+        
+        # Pastas e arquivos satisfazem dependentes por existirem, mesmo se o conteúdo falhar
+        satisfied = result.exists if result.exists is not None else result.status == 'ok'
+        blocked_by = self.blocking_dependency(node) if result.status == 'skipped' else None
+        self.check_status[node['id']] = {'status': result.status, 'satisfied': satisfied, 'blocked_by': blocked_by}
+        self.completed[node['id']] = result
+        
+        if self.fail_fast and not result.passed and result.status != 'timed_out' and not self.stop_reason:
+            self.stop_reason = f"fail-fast após falha em {node['id']}"
+            for check_id, owner in list(self._running_checks.items()):
+                self._cancelled.add(check_id)
+                self.cancel_running(owner)
+    
+    def run_checks(self, check_type=None):
+        """
+        Executa as verificações do grafo (opcionalmente só de um tipo) no pool de workers
+        Respeita as dependências e começa pelas de caminho crítico mais longo (no fail-fast, pelas mais baratas;
+        com prazo total, as baratas antes das caras); os resultados ficam na ordem do grafo
+        """
+        nodes = [node for node in self.check_graph if check_type is None or node['type'] == check_type]
+        predicted = estimate_durations(nodes, self.history)
+        self.predicted_durations.update(predicted)
+        
+        self.completed = {}
+        if self.fail_fast:
+            ranks = cheapest_first_ranks(nodes, predicted)
+        else:
+            ranks = upward_ranks(nodes, predicted)
+            # Com prazo total, as verificações baratas rodam antes e sempre entram no relatório parcial
+            if self.budgets.deadline.seconds is not None:
+                ranks = cheap_first_ranks(nodes, predicted, ranks)
+        run_longest_first(
+            nodes, ranks, self.workers,
+            self.prepare_check, self.execute_with_deadline, self.record_result
+        )
+        self.results.extend(self.completed[node['id']] for node in nodes)
+        
+        if self.update_history:
+            for node in nodes:
+                # Verificações interrompidas pelo fail-fast não representam a duração real
+                if node['id'] in self.durations and node['id'] not in self._cancelled:
+                    self.history.record('checks', node['id'], self.durations[node['id']])
+            self.history.save()
     
     def run_all_validations(self):
         """Executa todas as validações configuradas"""
         print(f"🔍 Iniciando validações: {self.config.get('name', 'Configuração sem nome')}")
         print(f"📝 {self.config.get('description', '')}")
+        if self.fail_fast:
+            print("⚡ Modo fail-fast ativo: interrompe na primeira falha obrigatória")
+        if self.budgets.deadline.seconds is not None:
+            print(f"⏱️ Prazo total: {self.budgets.deadline.seconds:g}s")
+        if self.workers > 1:
+            order = "as mais curtas primeiro" if self.fail_fast else "as mais longas primeiro"
+            print(f"🧵 {self.workers} verificações em paralelo, {order}")
         print("-" * 50)
         
-        self.validate_folders()
-        self.validate_files()
-        self.validate_api_endpoints()
-        self.run_custom_scripts()
+        started = time.monotonic()
+        self.run_checks()
+        
+        if self.update_history:
+            repository = os.environ.get('GITHUB_REPOSITORY') or os.path.basename(os.getcwd())
+            self.history.record('repos', repository, time.monotonic() - started)
+            self.history.save()
         
         return self.results
     
+    def schedule_report(self):
+        """Caminho crítico previsto (histórico/heurística) e real (durações medidas) da execução"""
+        nodes = [node for node in self.check_graph if node['id'] in self.predicted_durations]
+        return {
+            'workers': self.workers,
+            'predicted_critical_path': critical_path(nodes, self.predicted_durations),
+            'actual_critical_path': critical_path(nodes, self.durations),
+            'durations': {check_id: round(seconds, 3) for check_id, seconds in self.durations.items()}
+        }
+    
+    def critical_path_lines(self, schedule):
+        """Linhas do relatório com os caminhos críticos previsto e real"""
+        lines = []
+        for label, key in (('previsto', 'predicted_critical_path'), ('real', 'actual_critical_path')):
+            path = schedule[key]
+            if path['checks']:
+                lines.append(f"🛣️ Caminho crítico {label}: {path['seconds']:.1f}s ({' → '.join(path['checks'])})")
+        return lines
+    
     def generate_report(self):
         """Gera relatório das validações"""
         total_validations = len(self.results)
-        passed_validations = sum(1 for r in self.results if r['passed'])
+        passed_validations = sum(1 for r in self.results if r.passed)
         failed_validations = total_validations - passed_validations
+        skipped_validations = sum(1 for r in self.results if r.status == 'skipped')
+        timed_out_validations = sum(1 for r in self.results if r.status == 'timed_out')
         
         report = {
             'summary': {
                 'total': total_validations,
                 'passed': passed_validations,
                 'failed': failed_validations,
+                'skipped': skipped_validations,
+                'timed_out': timed_out_validations,
+                'elapsed': round(self.budgets.deadline.elapsed(), 2),
                 'success_rate': (passed_validations / total_validations * 100) if total_validations > 0 else 0
             },
             'details': self.results,
-            'config': self.config
+            # A configuração é referenciada pelo hash, não copiada em cada relatório
+            'config_sha256': self.config_sha256,
+            'schedule': self.schedule_report()
         }
         
         return report
@@ -247,7 +824,12 @@ class ValidationEngine:
         lines.append(f"Total: {report['summary']['total']}")
         lines.append(f"✅ Passou: {report['summary']['passed']}")
         lines.append(f"❌ Falhou: {report['summary']['failed']}")
+        if report['summary']['skipped']:
+            lines.append(f"⏭️ Ignoradas: {report['summary']['skipped']}")
+        if report['summary']['timed_out']:
+            lines.append(f"⏱️ Tempo esgotado: {report['summary']['timed_out']} (relatório parcial)")
         lines.append(f"📈 Taxa de sucesso: {report['summary']['success_rate']:.1f}%")
+        lines.extend(self.critical_path_lines(report['schedule']))
         
         lines.append("")
         lines.append("-" * 50)
@@ -255,12 +837,11 @@ class ValidationEngine:
         lines.append("-" * 50)
         
         for result in self.results:
-            lines.append(f"{result['message']}")
+            lines.append(result.message)
             
             # Mostra detalhes de validações de conteúdo
-            if 'validations' in result:
-                for validation in result['validations']:
-                    lines.append(f"   └─ {validation['message']}")
+            for validation in result.validations or []:
+                lines.append(f"   └─ {validation['message']}")
         
         lines.append("")
         lines.append("=" * 50)
@@ -277,19 +858,24 @@ class ValidationEngine:
         print(f"Total: {report['summary']['total']}")
         print(f"✅ Passou: {report['summary']['passed']}")
         print(f"❌ Falhou: {report['summary']['failed']}")
+        if report['summary']['skipped']:
+            print(f"⏭️ Ignoradas: {report['summary']['skipped']}")
+        if report['summary']['timed_out']:
+            print(f"⏱️ Tempo esgotado: {report['summary']['timed_out']} (relatório parcial)")
         print(f"📈 Taxa de sucesso: {report['summary']['success_rate']:.1f}%")
+        for line in self.critical_path_lines(report['schedule']):
+            print(line)
         
         print("\n" + "-"*50)
         print("📋 DETALHES")
         print("-"*50)
         
         for result in self.results:
-            print(f"{result['message']}")
+            print(result.message)
             
             # Mostra detalhes de validações de conteúdo
-            if 'validations' in result:
-                for validation in result['validations']:
-                    print(f"   └─ {validation['message']}")
+            for validation in result.validations or []:
+                print(f"   └─ {validation['message']}")
         
         print("\n" + "="*50)
         
@@ -301,32 +887,51 @@ def main():
     # Determina caminho do arquivo de configuração
     config_path = os.environ.get('VALIDATION_CONFIG', 'cursos/sistemas-informacao/M07/config/validation-config.yml')
     
-    if not os.path.exists(config_path):
+    if not os.path.exists(config_path) and not is_compiled_current(config_path):
         print(f"❌ Arquivo de configuração não encontrado: {config_path}")
         return 1
     
+    fail_fast = os.environ.get('VALIDATION_FAIL_FAST')
+    fail_fast = fail_fast.lower() in ('1', 'true', 'yes') if fail_fast else None
+    timeout = os.environ.get('VALIDATION_TIMEOUT')
+    timeout = float(timeout) if timeout else None
+    max_timeout = os.environ.get('VALIDATION_MAX_TIMEOUT')
+    max_timeout = float(max_timeout) if max_timeout else None
+    workers = os.environ.get('VALIDATION_WORKERS')
+    workers = int(workers) if workers else None
+    
     try:
         # Executa validações
-        engine = ValidationEngine(config_path)
+        engine = ValidationEngine(
+            config_path, fail_fast=fail_fast, timeout=timeout, workers=workers, max_timeout=max_timeout,
+            history_path=os.environ.get('VALIDATION_HISTORY'),
+            update_history=os.environ.get('VALIDATION_HISTORY_UPDATE', '1') != '0'
+        )
         engine.run_all_validations()
         exit_code = engine.print_results()
         
         # Salvar resultados para compatibilidade com sistema de notificações
         report = engine.generate_report()
         detailed_text = engine.generate_detailed_report_text()
+        summary = f"{report['summary']['passed']}/{report['summary']['total']} validações passaram"
+        if report['summary']['timed_out']:
+            summary += f" (⏱️ {report['summary']['timed_out']} não concluídas: tempo esgotado)"
         
-        with open("results.json", "w", encoding="utf-8") as f:
+        with open(os.environ.get("RESULTS_FILE", "results.json"), "w", encoding="utf-8") as f:
             json.dump({
-                "config_name": report['config'].get('name', 'Validação'),
-                "config_description": report['config'].get('description', ''),
-                "summary": f"{report['summary']['passed']}/{report['summary']['total']} validações passaram",
+                "config_name": engine.config.get('name', 'Validação'),
+                "config_description": engine.config.get('description', ''),
+                "summary": summary,
+                "timed_out": report['summary']['timed_out'] > 0,
                 "status": "success" if exit_code == 0 else "failed",
                 "details": report['details'],
-                "config": report['config'],
+                "config_path": config_path,
+                "config_sha256": report['config_sha256'],
+                "schedule": report['schedule'],
                 "success_rate": report['summary']['success_rate'],
                 "detailed_report": detailed_text,
                 "summary_stats": report['summary']
-            }, f, indent=2, ensure_ascii=False)
+            }, f, indent=2, ensure_ascii=False, default=to_json)
         
         return exit_code
         
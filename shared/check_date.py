@@ -1,9 +1,10 @@
-import os, sys, requests
+import os, sys
 from datetime import datetime, timedelta, timezone
+from utils import http_client
 
 def main():
     url = os.environ["DATE_SOURCE_URL"]
-    data = requests.get(url).json()
+    data = http_client.get(url).json()
 
     # Ajuste para UTC-3
     tz_brt = timezone(timedelta(hours=-3))
@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Verifica similaridade de código entre as entregas de uma turma
+Uso: python shared/check_similarity.py [--index similarity.db] aluno1=caminho/repo1 aluno2=caminho/repo2 ...
+"""
+
+import argparse
+import json
+import os
+import sys
+
+from shared.utils.similarity import SimilarityIndex
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Detecta arquivos de código quase duplicados entre repositórios")
+    parser.add_argument("repos", nargs="*", help="Repositórios a indexar, como nome=caminho ou apenas caminho")
+    parser.add_argument("--index", default=os.environ.get("SIMILARITY_INDEX", "similarity-index.db"),
+                        help="Arquivo do índice persistente")
+    parser.add_argument("--src", default="src", help="Pasta de código dentro de cada repositório")
+    parser.add_argument("--threshold", type=float, default=0.8, help="Similaridade mínima para reportar")
+    parser.add_argument("--output", default="similarity-report.json", help="Arquivo do relatório")
+    parser.add_argument("--full", action="store_true",
+                        help="Reporta todos os pares do índice, não só os que envolvem os repositórios novos")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    index = SimilarityIndex(args.index)
+
+    try:
+        added = []
+        for entry in args.repos:
+            name, _, path = entry.rpartition("=")
+            name = name or os.path.basename(os.path.abspath(path))
+            if not os.path.isdir(path):
+                print(f"❌ Repositório não encontrado: {path}")
+                return 1
+            count = index.add_repository(name, path, args.src)
+            added.append(name)
+            print(f"📥 {name}: {count} arquivos indexados")
+
+        pairs = index.similar_pairs(args.threshold, None if args.full else added)
+        repos = index.repositories()
+    finally:
+        index.close()
+
+    print(f"🔍 {len(pairs)} pares com similaridade >= {args.threshold:.0%} ({len(repos)} repositórios no índice)")
+    for pair in pairs:
+        print(f"   └─ {pair['similarity']:.0%} {pair['repo_a']}:{pair['file_a']} ↔ {pair['repo_b']}:{pair['file_b']}")
+
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump({
+            "threshold": args.threshold,
+            "repositories": repos,
+            "checked": added,
+            "pairs": pairs
+        }, f, indent=2, ensure_ascii=False)
+
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
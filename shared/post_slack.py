@@ -1,9 +1,9 @@
 # Utilitário para postar no Slack
 import os
 import json
-import yaml
-import requests
 from utils.slack_format import format_message
+from utils.config_loader import load_config
+from utils import http_client
 
 def load_validation_results():
     """Carrega resultados das validações"""
@@ -28,9 +28,8 @@ def should_send_notification():
         return True  # Default: sempre envia se não há configuração
     
     try:
-        with open(config_path, 'r', encoding='utf-8') as f:
-            config = yaml.safe_load(f)
-            return config.get('notification', {}).get('slack', {}).get('enabled', True)
+        config = load_config(config_path)
+        return config.get('notification', {}).get('slack', {}).get('enabled', True)
     except:
         return True  # Em caso de erro, envia por segurança
 
@@ -49,7 +48,7 @@ def main():
         payload = format_message(results)
         
         print(f"📤 Enviando notificação para o Slack...")
-        response = requests.post(webhook_url, json=payload, timeout=10)
+        response = http_client.post(webhook_url, json=payload, timeout=10)
         if response.status_code == 200:
             print("✅ Notificação enviada para o Slack com sucesso")
         else:
@@ -0,0 +1,189 @@
+"""
+Grafo de dependências entre verificações
+Infere pré-requisitos por prefixo de caminho ou pela chave `requires:`
+"""
+
+import heapq
+import posixpath
+import shlex
+import sys
+
+# Campo que identifica cada tipo de verificação
+CHECK_KEY_FIELDS = {
+    'folder': 'path',
+    'file': 'path',
+    'api': 'url',
+    'script': 'name',
+    'repository': 'type',
+}
+
+def normalize_path(path):
+    """Normaliza caminho relativo para comparação por prefixo"""
+    path = posixpath.normpath(str(path).replace('\\', '/'))
+    return '' if path == '.' else path
+
+def check_id(check_type, check_config):
+    """
+    Retorna identificador da verificação (`id` explícito ou `<tipo>:<chave>`), internado
+    APIs com método diferente de GET incluem o método: `api:POST <url>`
+    """
+    if check_config.get('id'):
+        return sys.intern(str(check_config['id']))
+    key = check_config.get(CHECK_KEY_FIELDS.get(check_type, 'name'), '')
+    if CHECK_KEY_FIELDS.get(check_type) == 'path':
+        key = normalize_path(key)
+    method = str(check_config.get('method', 'GET')).upper()
+    if check_type == 'api' and method != 'GET':
+        key = f"{method} {key}"
+    return sys.intern(f"{check_type}:{key}")
+
+def assign_ids(nodes):
+    """
+    Garante ids únicos: ids explícitos repetidos são erro; ids padrão repetidos ganham sufixo `#2`, `#3`...
+    Retorna os ids padrão que se repetiram (ambíguos em `requires:`)
+    """
+    taken = set()
+    for node in nodes:
+        if node['config'].get('id'):
+            if node['id'] in taken:
+                raise Exception(f"Verificação duplicada: {node['id']}")
+            taken.add(node['id'])
+
+    ambiguous = set()
+    for node in nodes:
+        if node['config'].get('id'):
+            continue
+        base, count = node['id'], 1
+        while node['id'] in taken:
+            count += 1
+            node['id'] = sys.intern(f"{base}#{count}")
+        if count > 1:
+            ambiguous.add(base)
+        taken.add(node['id'])
+    return ambiguous
+
+def path_ancestors(path):
+    """Lista os diretórios ancestrais de um caminho, do mais próximo ao mais distante"""
+    ancestors = []
+    parent = posixpath.dirname(normalize_path(path))
+    while parent:
+        ancestors.append(parent)
+        parent = posixpath.dirname(parent)
+    return ancestors
+
+def script_paths(script):
+    """Extrai tokens de um comando shell que parecem caminhos relativos"""
+    try:
+        tokens = shlex.split(script)
+    except ValueError:
+        tokens = script.split()
+
+    paths = []
+    for token in tokens:
+        if token.startswith('-') or '://' in token or token.startswith('/'):
+            continue
+        if '/' in token or '.' in token:
+            paths.append(normalize_path(token))
+    return paths
+
+def infer_dependencies(node, folders, files):
+    """Infere pré-requisitos de uma verificação a partir dos caminhos envolvidos"""
+    config = node['config']
+    if node['type'] in ('folder', 'file'):
+        candidates = [config.get('path', '')]
+    elif node['type'] == 'script':
+        candidates = script_paths(config.get('script', ''))
+    else:
+        candidates = []
+
+    requires = []
+    for path in candidates:
+        path = normalize_path(path)
+        if node['type'] == 'script':
+            # Scripts dependem do próprio caminho citado, se ele for verificado
+            for index in (folders.get(path), files.get(path)):
+                if index is not None:
+                    requires.append(index)
+        for ancestor in path_ancestors(path):
+            if ancestor in folders:
+                requires.append(folders[ancestor])
+    return requires
+
+def resolve_reference(reference, nodes, by_id, ambiguous=()):
+    """Resolve uma entrada de `requires:` pelo id ou pelo caminho/url/nome da verificação"""
+    if reference in ambiguous:
+        raise Exception(f"Dependência ambígua em requires: {reference} (use o id da verificação)")
+    if reference in by_id:
+        return by_id[reference]
+
+    matches = [
+        node['index'] for node in nodes
+        if normalize_path(node['key']) == normalize_path(reference) or node['key'] == reference
+    ]
+    if len(matches) == 1:
+        return matches[0]
+    if not matches:
+        raise Exception(f"Dependência desconhecida em requires: {reference}")
+    raise Exception(f"Dependência ambígua em requires: {reference} (use o id da verificação)")
+
+def build_check_graph(config, stages):
+    """
+    Monta a lista de verificações em ordem topológica
+    `stages` é uma lista de pares (seção do YAML, tipo da verificação)
+    """
+    validations = config.get('validations', {}) or {}
+    nodes = []
+    for section, check_type in stages:
+        for check_config in validations.get(section, None) or []:
+            nodes.append({
+                'index': len(nodes),
+                'id': check_id(check_type, check_config),
+                'type': check_type,
+                'key': str(check_config.get(CHECK_KEY_FIELDS.get(check_type, 'name'), '')),
+                'config': check_config,
+                'requires': [],
+            })
+
+    ambiguous = assign_ids(nodes)
+    by_id = {node['id']: node['index'] for node in nodes}
+
+    folders = {normalize_path(n['key']): n['index'] for n in nodes if n['type'] == 'folder'}
+    files = {normalize_path(n['key']): n['index'] for n in nodes if n['type'] == 'file'}
+
+    for node in nodes:
+        requires = infer_dependencies(node, folders, files)
+        explicit = node['config'].get('requires', []) or []
+        if isinstance(explicit, str):
+            explicit = [explicit]
+        requires += [resolve_reference(reference, nodes, by_id, ambiguous) for reference in explicit]
+        # Remove auto-referências e duplicatas preservando a ordem
+        for index in requires:
+            required_id = nodes[index]['id']
+            if index != node['index'] and required_id not in node['requires']:
+                node['requires'].append(required_id)
+
+    return topological_order(nodes, by_id)
+
+def topological_order(nodes, by_id):
+    """Ordena as verificações respeitando dependências e a ordem original do YAML"""
+    pending = {node['index']: len(node['requires']) for node in nodes}
+    dependents = {node['index']: [] for node in nodes}
+    for node in nodes:
+        for required_id in node['requires']:
+            dependents[by_id[required_id]].append(node['index'])
+
+    ready = [index for index, count in pending.items() if count == 0]
+    heapq.heapify(ready)
+    ordered = []
+    while ready:
+        index = heapq.heappop(ready)
+        ordered.append(nodes[index])
+        for dependent in dependents[index]:
+            pending[dependent] -= 1
+            if pending[dependent] == 0:
+                heapq.heappush(ready, dependent)
+
+    if len(ordered) != len(nodes):
+        cycle = [nodes[i]['id'] for i, count in pending.items() if count > 0]
+        raise Exception(f"Dependência circular entre verificações: {', '.join(cycle)}")
+    return ordered
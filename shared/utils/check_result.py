@@ -0,0 +1,111 @@
+"""
+Registro compacto do resultado de uma verificação
+Campos fixos em __slots__, textos repetidos internados e mensagem montada só quando é lida
+"""
+
+import sys
+
+STATUS_ICONS = {
+    'ok': '✅',
+    'failed': '❌',
+    'skipped': '⏭️',
+    'timed_out': '⏱️',
+}
+
+# Campo do JSON que identifica o alvo de cada tipo de verificação
+TARGET_FIELDS = {
+    'folder': 'path',
+    'file': 'path',
+    'api': 'url',
+    'script': 'name',
+    'repository': 'check',
+}
+
+def intern(value):
+    return sys.intern(value) if type(value) is str else value
+
+class CheckResult:
+    """
+    Resultado de uma verificação
+    A mensagem é `<ícone> <descrição><nota>`; campos raros ficam em `extra`
+    """
+
+    __slots__ = (
+        'type', 'id', 'target', 'description', 'required', 'passed', 'status',
+        'icon', 'note', 'exists', 'validations', 'details', 'extra',
+    )
+
+    def __init__(self, check_type, target, description, required, passed, status,
+                 note='', icon=None, exists=None, validations=None, details=None, **extra):
+        self.type = intern(check_type)
+        self.id = None
+        self.target = intern(target)
+        self.description = intern(description)
+        self.required = required
+        self.passed = passed
+        self.status = intern(status)
+        self.icon = icon
+        self.note = note
+        self.exists = exists
+        self.validations = validations
+        self.details = details
+        self.extra = extra or None
+
+    @property
+    def message(self):
+        icon = self.icon or STATUS_ICONS.get(self.status, '❌')
+        return f"{icon} {self.description}{self.note}"
+
+    def fail(self, note):
+        """Marca como falha (por exemplo, quando uma validação de conteúdo não passa)"""
+        self.passed = False
+        self.status = 'failed'
+        self.icon = None
+        self.note = note
+
+    def to_dict(self):
+        """Formato JSON dos relatórios (mesmas chaves dos resultados em dicionário)"""
+        data = {'type': self.type}
+        if self.target is not None:
+            data[TARGET_FIELDS.get(self.type, 'name')] = self.target
+        data['id'] = self.id
+        data['description'] = self.description
+        data['required'] = self.required
+        data['passed'] = self.passed
+        data['status'] = self.status
+        data['message'] = self.message
+        if self.exists is not None:
+            data['exists'] = self.exists
+        if self.validations is not None:
+            data['validations'] = self.validations
+        if self.details is not None:
+            data['details'] = self.details
+        if self.extra:
+            data.update(self.extra)
+        return data
+
+    def get(self, key, default=None):
+        """Acesso por chave, como nos resultados em dicionário"""
+        if key == TARGET_FIELDS.get(self.type):
+            return self.target
+        if key in ('type', 'id', 'description', 'required', 'passed', 'status', 'message'):
+            return getattr(self, key)
+        if key in ('exists', 'validations', 'details'):
+            value = getattr(self, key)
+            return default if value is None else value
+        return (self.extra or {}).get(key, default)
+
+    def __getitem__(self, key):
+        value = self.get(key, KeyError)
+        if value is KeyError:
+            raise KeyError(key)
+        return value
+
+    def __contains__(self, key):
+        return self.get(key, KeyError) is not KeyError
+
+def to_json(value):
+    """`default` para json.dump: serializa CheckResult sem montar todos os dicionários antes"""
+    if isinstance(value, CheckResult):
+        return value.to_dict()
+    raise TypeError(f"Objeto não serializável: {type(value).__name__}")
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Carregamento de configurações sem dependências externas
+O YAML é pré-compilado para JSON (com o hash do original); o PyYAML só é necessário para compilar
+Uso: python shared/utils/config_loader.py compile|check <config.yml> [...]
+"""
+
+import hashlib
+import json
+import os
+import sys
+
+def compiled_path(path):
+    """Caminho da versão compilada: validation-config.yml -> validation-config.json"""
+    return os.path.splitext(path)[0] + ".json"
+
+def source_digest(path):
+    with open(path, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+def config_digest(config):
+    """Hash do conteúdo da configuração, igual para o YAML e a versão compilada"""
+    canonical = json.dumps(config, sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+def _read_compiled(path):
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+def is_compiled_current(path):
+    """Indica se existe versão compilada correspondente ao YAML atual"""
+    compiled = compiled_path(path)
+    if not os.path.exists(compiled):
+        return False
+    if not os.path.exists(path):
+        return True
+    return _read_compiled(compiled).get("source_sha256") == source_digest(path)
+
+def load_yaml(path):
+    try:
+        import yaml
+    except ImportError:
+        raise Exception(
+            f"PyYAML não instalado e {compiled_path(path)} ausente ou desatualizado; "
+            f"rode: python shared/utils/config_loader.py compile {path}"
+        )
+    with open(path, "r", encoding="utf-8") as f:
+        return yaml.safe_load(f)
+
+def load_config(path):
+    """Carrega a configuração, preferindo a versão JSON compilada quando ela está atualizada"""
+    if path.endswith(".json"):
+        data = _read_compiled(path)
+        return data["config"] if isinstance(data, dict) and "source_sha256" in data else data
+
+    if is_compiled_current(path):
+        return _read_compiled(compiled_path(path))["config"]
+    return load_yaml(path)
+
+def write_compiled(config, path, digest=None):
+    """Grava a versão compilada de uma configuração"""
+    output = compiled_path(path)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump({
+            "source": os.path.basename(path),
+            "source_sha256": digest,
+            "config": config
+        }, f, indent=2, ensure_ascii=False)
+        f.write("\n")
+    return output
+
+def compile_config(path):
+    """Compila o YAML para JSON ao lado do arquivo original"""
+    return write_compiled(load_yaml(path), path, source_digest(path))
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if len(argv) < 2 or argv[0] not in ("compile", "check"):
+        print("Uso: python shared/utils/config_loader.py compile|check <config.yml> [...]")
+        return 1
+
+    command, paths = argv[0], argv[1:]
+    exit_code = 0
+    for path in paths:
+        if command == "compile":
+            print(f"✅ {path} -> {compile_config(path)}")
+        elif is_compiled_current(path):
+            print(f"✅ {compiled_path(path)} atualizado")
+        else:
+            print(f"❌ {compiled_path(path)} ausente ou desatualizado")
+            exit_code = 1
+    return exit_code
+
+if __name__ == "__main__":
+    sys.exit(main())
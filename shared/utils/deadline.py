@@ -0,0 +1,66 @@
+"""
+Prazos de execução das validações
+Um prazo global e orçamentos por etapa; o tempo restante limita cada verificação
+"""
+
+import time
+
+class Deadline:
+    """Prazo absoluto a partir da criação (sem limite quando seconds é None)"""
+
+    def __init__(self, seconds=None, clock=time.monotonic):
+        self.clock = clock
+        self.seconds = seconds
+        self.started = clock()
+
+    def elapsed(self):
+        return self.clock() - self.started
+
+    def remaining(self):
+        if self.seconds is None:
+            return None
+        return max(0.0, self.seconds - self.elapsed())
+
+    def expired(self):
+        return self.seconds is not None and self.elapsed() >= self.seconds
+
+class StageBudgets:
+    """
+    Prazo global mais orçamento de tempo por etapa (tipo de verificação)
+    O orçamento de uma etapa é consumido pela soma das durações das suas verificações
+    """
+
+    def __init__(self, total=None, stages=None, clock=time.monotonic):
+        self.deadline = Deadline(total, clock)
+        self.budgets = dict(stages or {})
+        self.spent = {}
+
+    def remaining(self, stage):
+        """Tempo disponível para a etapa: o menor entre o prazo global e o que sobra do orçamento dela"""
+        limits = []
+        if self.deadline.seconds is not None:
+            limits.append(self.deadline.remaining())
+        if self.budgets.get(stage) is not None:
+            limits.append(max(0.0, self.budgets[stage] - self.spent.get(stage, 0.0)))
+        return min(limits) if limits else None
+
+    def exhausted(self, stage):
+        remaining = self.remaining(stage)
+        return remaining is not None and remaining <= 0
+
+    def timeout(self, stage, default):
+        """Timeout de uma operação da etapa: o padrão dela, limitado pelo tempo restante"""
+        remaining = self.remaining(stage)
+        return default if remaining is None else min(default, remaining)
+
+    def charge(self, stage, seconds):
+        self.spent[stage] = self.spent.get(stage, 0.0) + seconds
+
+    def reason(self, stage):
+        """Descrição do limite que se esgotou (ou está por se esgotar) para a etapa: o que sobra menos tempo"""
+        budget = self.budgets.get(stage)
+        if budget is not None and (
+            self.deadline.seconds is None or budget - self.spent.get(stage, 0.0) < self.deadline.remaining()
+        ):
+            return f"orçamento da etapa {stage} ({budget:g}s) esgotado"
+        return f"prazo total de {self.deadline.seconds:g}s esgotado"
@@ -0,0 +1,71 @@
+"""
+Histórico local de durações observadas
+Média móvel exponencial por verificação (`checks`) e por repositório (`repos`), gravada em JSON
+"""
+
+import json
+import os
+import tempfile
+
+# Peso da observação mais recente na média
+SMOOTHING = 0.3
+
+class DurationHistory:
+    """Durações médias por chave; sem caminho, funciona só em memória"""
+
+    def __init__(self, path=None):
+        self.path = path
+        self.data = {'checks': {}, 'repos': {}}
+        if path and os.path.exists(path):
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    loaded = json.load(f)
+                for kind in self.data:
+                    self.data[kind].update(loaded.get(kind, {}))
+            except (OSError, ValueError, AttributeError):
+                pass  # Histórico corrompido só faz perder as estimativas
+
+    def estimate(self, kind, key, default=None):
+        entry = self.data[kind].get(key)
+        return entry['seconds'] if entry else default
+
+    def runs(self, kind, key):
+        entry = self.data[kind].get(key)
+        return entry['runs'] if entry else 0
+
+    def record(self, kind, key, seconds):
+        entry = self.data[kind].get(key)
+        if entry is None:
+            self.data[kind][key] = {'seconds': round(seconds, 3), 'runs': 1}
+        else:
+            entry['seconds'] = round(entry['seconds'] + SMOOTHING * (seconds - entry['seconds']), 3)
+            entry['runs'] += 1
+
+    def merge(self, other):
+        """Junta outro histórico, mantendo para cada chave a entrada com mais observações"""
+        for kind, entries in other.data.items():
+            for key, entry in entries.items():
+                if entry['runs'] > self.runs(kind, key):
+                    self.data[kind][key] = dict(entry)
+        return self
+
+    def save(self, path=None):
+        """
+        Grava de forma atômica (um processo interrompido não corrompe o histórico)
+        O histórico é só uma dica de escalonamento: falha ao gravar vira aviso, não erro
+        """
+        path = path or self.path
+        if not path:
+            return None
+        tmp_path = None
+        try:
+            fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(path)), suffix='.tmp')
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(self.data, f, indent=2, ensure_ascii=False, sort_keys=True)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            print(f"⚠️ Histórico de durações não gravado em {path}: {e}")
+            if tmp_path and os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            return None
+        return path
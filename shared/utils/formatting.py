@@ -10,4 +10,12 @@ def format_validation_result(result):
 def format_summary(total, passed, failed):
     """Formata resumo das validações"""
     success_rate = percent(passed, total)
-    return f"📊 Total: {total} | ✅ Passou: {passed} | ❌ Falhou: {failed} | 📈 Taxa: {success_rate:.1f}%"
\ No newline at end of file
+    return f"📊 Total: {total} | ✅ Passou: {passed} | ❌ Falhou: {failed} | 📈 Taxa: {success_rate:.1f}%"
+
+def format_size(size):
+    """Formata tamanho em bytes de forma legível"""
+    for unit in ("B", "KB", "MB"):
+        if size < 1024:
+            return f"{size:.0f} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.1f} GB"
\ No newline at end of file
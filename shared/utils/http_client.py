@@ -0,0 +1,158 @@
+"""
+Cliente HTTP mínimo sobre http.client
+Reaproveita conexões por host (keep-alive) e segue redirecionamentos, sem depender do requests
+"""
+
+import http.client
+import json as jsonlib
+import socket
+import threading
+from urllib.parse import urljoin, urlsplit
+
+MAX_REDIRECTS = 5
+REDIRECT_STATUSES = {301, 302, 303, 307, 308}
+USER_AGENT = "ci-cd-templates-validation"
+
+class Response:
+    """Resposta já lida por completo (headers sem distinção de maiúsculas)"""
+
+    def __init__(self, status_code, headers, content, url):
+        self.status_code = status_code
+        self.headers = headers
+        self.content = content
+        self.url = url
+
+    @property
+    def text(self):
+        return self.content.decode("utf-8", errors="replace")
+
+    def json(self):
+        return jsonlib.loads(self.content)
+
+class ConnectionPool:
+    """Conexões ociosas por (esquema, host, porta), reutilizadas entre requisições"""
+
+    def __init__(self, max_idle_per_host=4):
+        self.max_idle_per_host = max_idle_per_host
+        self._idle = {}
+        # Conexão em uso -> (socket, thread dona); a conexão solta o socket quando a resposta fecha a conexão
+        self._active = {}
+        self._lock = threading.Lock()
+        self._generation = 0  # incrementado por close_all: requisições canceladas não são repetidas
+
+    def _acquire(self, key, timeout):
+        with self._lock:
+            idle = self._idle.get(key)
+            connection = idle.pop() if idle else None
+        reused = connection is not None
+        if connection is None:
+            scheme, host, port = key
+            connection_class = http.client.HTTPSConnection if scheme == "https" else http.client.HTTPConnection
+            connection = connection_class(host, port, timeout=timeout)
+        connection.timeout = timeout
+        if connection.sock is not None:
+            connection.sock.settimeout(timeout)
+        with self._lock:
+            self._active[connection] = (None, threading.get_ident())
+        return connection, reused
+
+    def _release(self, key, connection, keep):
+        with self._lock:
+            self._active.pop(connection, None)
+            idle = self._idle.setdefault(key, [])
+            if keep and len(idle) < self.max_idle_per_host:
+                idle.append(connection)
+                return
+        connection.close()
+
+    def _send(self, method, url, body, headers, timeout):
+        parts = urlsplit(url)
+        if parts.scheme not in ("http", "https"):
+            raise ValueError(f"URL não suportada: {url}")
+        key = (parts.scheme, parts.hostname, parts.port or (443 if parts.scheme == "https" else 80))
+        path = parts.path or "/"
+        if parts.query:
+            path += "?" + parts.query
+
+        # Uma conexão reaproveitada pode ter sido fechada pelo servidor: tenta de novo com uma nova
+        generation = self._generation
+        for attempt in range(2):
+            connection, reused = self._acquire(key, timeout)
+            try:
+                connection.request(method, path, body=body, headers=headers)
+                with self._lock:
+                    if connection in self._active:
+                        self._active[connection] = (connection.sock, threading.get_ident())
+                response = connection.getresponse()
+                content = response.read()
+            except (http.client.RemoteDisconnected, BrokenPipeError, ConnectionResetError):
+                self._release(key, connection, keep=False)
+                if reused and attempt == 0 and generation == self._generation:
+                    continue
+                raise
+            except BaseException:
+                self._release(key, connection, keep=False)
+                raise
+            self._release(key, connection, keep=not response.will_close)
+            return Response(response.status, response.msg, content, url)
+
+    def request(self, method, url, json=None, data=None, headers=None, timeout=10, allow_redirects=True):
+        """Executa a requisição; `json` serializa o corpo como JSON"""
+        headers = dict(headers or {})
+        headers.setdefault("User-Agent", USER_AGENT)
+        body = data
+        if json is not None:
+            body = jsonlib.dumps(json).encode("utf-8")
+            headers.setdefault("Content-Type", "application/json")
+        if isinstance(body, str):
+            body = body.encode("utf-8")
+
+        method = method.upper()
+        for _ in range(MAX_REDIRECTS + 1):
+            response = self._send(method, url, body, headers, timeout)
+            if not allow_redirects or response.status_code not in REDIRECT_STATUSES or "Location" not in response.headers:
+                return response
+            url = urljoin(url, response.headers["Location"])
+            # Mesmo comportamento do requests: 303 (e 301/302 após POST) viram GET sem corpo
+            if response.status_code == 303 or (response.status_code in (301, 302) and method == "POST"):
+                method = "GET"
+                body = None
+                headers.pop("Content-Type", None)
+        return response
+
+    def close_all(self, owner=None):
+        """
+        Fecha conexões ociosas e interrompe as que estão em uso (pode ser chamado de outra thread)
+        Com `owner` (ident de uma thread), interrompe só as requisições daquela thread
+        """
+        with self._lock:
+            self._generation += 1
+            connections = [
+                (connection, sock) for connection, (sock, thread) in self._active.items()
+                if owner is None or thread == owner
+            ]
+            if owner is None:
+                connections += [(c, c.sock) for idle in self._idle.values() for c in idle]
+                self._idle = {}
+        for connection, sock in connections:
+            # shutdown acorda a thread bloqueada lendo do socket; só close não basta
+            if sock is not None:
+                try:
+                    sock.shutdown(socket.SHUT_RDWR)
+                except OSError:
+                    pass
+            connection.close()
+
+_default_pool = ConnectionPool()
+
+def request(method, url, **kwargs):
+    return _default_pool.request(method, url, **kwargs)
+
+def get(url, **kwargs):
+    return _default_pool.request("GET", url, **kwargs)
+
+def post(url, **kwargs):
+    return _default_pool.request("POST", url, **kwargs)
+
+def close_all(owner=None):
+    _default_pool.close_all(owner)
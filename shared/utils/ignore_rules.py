@@ -0,0 +1,183 @@
+"""
+Regras de .gitignore compiladas
+Permite podar pastas inteiras durante a varredura e listar arquivos versionados que deveriam ser ignorados
+"""
+
+import os
+import posixpath
+import re
+import subprocess
+
+# Padrões sempre ignorados (dependências, ambientes virtuais, builds e segredos locais)
+DEFAULT_IGNORES = [
+    '.git/',
+    'node_modules/',
+    '.venv/',
+    'venv/',
+    '__pycache__/',
+    '*.pyc',
+    '.pytest_cache/',
+    '.mypy_cache/',
+    'dist/',
+    'build/',
+    '.next/',
+    '.DS_Store',
+    '.env',
+    '.env.*',
+    '!.env.example',
+]
+
+def glob_to_regex(pattern):
+    """Traduz um padrão do .gitignore (sem barras nas pontas) para expressão regular"""
+    regex = []
+    i = 0
+    while i < len(pattern):
+        char = pattern[i]
+        if pattern.startswith('**/', i):
+            regex.append('(?:.*/)?')
+            i += 3
+            continue
+        if pattern.startswith('/**', i) and i + 3 == len(pattern):
+            regex.append('/.*')
+            i += 3
+            continue
+        if char == '*':
+            regex.append('.*' if pattern.startswith('**', i) else '[^/]*')
+            i += 2 if pattern.startswith('**', i) else 1
+            continue
+        if char == '?':
+            regex.append('[^/]')
+        elif char == '[':
+            end = pattern.find(']', i + 2)
+            if end == -1:
+                regex.append(re.escape(char))
+            else:
+                body = pattern[i + 1:end]
+                if body.startswith('!'):
+                    body = '^' + body[1:]
+                regex.append(f'[{body}]')
+                i = end
+        elif char == '\\' and i + 1 < len(pattern):
+            i += 1
+            regex.append(re.escape(pattern[i]))
+        else:
+            regex.append(re.escape(char))
+        i += 1
+    return ''.join(regex)
+
+def parse_rule(line, base=''):
+    """Converte uma linha do .gitignore em (regex, negado, só_pastas); None para comentários e linhas vazias"""
+    line = line.rstrip('\n').rstrip('\r')
+    if not line.endswith('\\ '):
+        line = line.rstrip(' ')
+    if not line or line.startswith('#'):
+        return None
+
+    negated = line.startswith('!')
+    if negated:
+        line = line[1:]
+    elif line.startswith('\\'):
+        line = line[1:]
+
+    dir_only = line.endswith('/')
+    line = line.rstrip('/')
+    if not line:
+        return None
+
+    # Padrões com barra no início ou no meio são relativos à pasta do .gitignore
+    anchored = '/' in line
+    line = line.lstrip('/')
+    regex = glob_to_regex(line)
+    if not anchored:
+        regex = '(?:.*/)?' + regex
+    if base:
+        regex = re.escape(base) + '/' + regex
+    return regex, negated, dir_only
+
+class IgnoreMatcher:
+    """
+    Conjunto de regras de ignore compilado em poucas expressões regulares
+    Regras consecutivas do mesmo tipo viram uma alternância; a última regra que casa decide
+    """
+
+    def __init__(self, patterns=(), base=''):
+        self.rules = []
+        self._groups = None
+        self._dir_cache = {}
+        self.add_patterns(patterns, base)
+
+    def add_patterns(self, patterns, base=''):
+        """Adiciona regras no formato do .gitignore, relativas à pasta `base`"""
+        for line in patterns:
+            rule = parse_rule(line, base)
+            if rule:
+                self.rules.append(rule)
+        self._groups = None
+        self._dir_cache = {}
+        return self
+
+    def add_gitignore(self, path, base=''):
+        """Adiciona as regras de um arquivo .gitignore, se ele existir"""
+        try:
+            with open(path, 'r', encoding='utf-8', errors='ignore') as file:
+                return self.add_patterns(file.readlines(), base)
+        except OSError:
+            return self
+
+    def _compiled(self):
+        if self._groups is None:
+            self._groups = []
+            for regex, negated, dir_only in self.rules:
+                if self._groups and self._groups[-1][1:] == (negated, dir_only):
+                    self._groups[-1][0].append(regex)
+                else:
+                    self._groups.append(([regex], negated, dir_only))
+            self._groups = [
+                (re.compile('(?:' + '|'.join(regexes) + ')'), negated, dir_only)
+                for regexes, negated, dir_only in reversed(self._groups)
+            ]
+        return self._groups
+
+    def matches(self, path, is_dir=False):
+        """Indica se as regras ignoram o próprio caminho (sem olhar as pastas acima)"""
+        path = posixpath.normpath(path.replace(os.sep, '/'))
+        for regex, negated, dir_only in self._compiled():
+            if dir_only and not is_dir:
+                continue
+            if regex.fullmatch(path):
+                return not negated
+        return False
+
+    def ignored_parent(self, path):
+        """Retorna a pasta ignorada mais externa que contém o caminho, se houver"""
+        parts = posixpath.normpath(path.replace(os.sep, '/')).split('/')[:-1]
+        current = ''
+        for part in parts:
+            current = f"{current}/{part}" if current else part
+            if current not in self._dir_cache:
+                self._dir_cache[current] = self.matches(current, is_dir=True)
+            if self._dir_cache[current]:
+                return current
+        return None
+
+    def is_ignored(self, path, is_dir=False):
+        """Indica se o caminho é ignorado, considerando também as pastas que o contêm"""
+        return self.ignored_parent(path) is not None or self.matches(path, is_dir)
+
+def load_matcher(root='.', extra_patterns=None):
+    """Monta o matcher com os padrões padrão (ou os configurados) e o .gitignore da raiz"""
+    matcher = IgnoreMatcher(DEFAULT_IGNORES if extra_patterns is None else extra_patterns)
+    return matcher.add_gitignore(os.path.join(root, '.gitignore'))
+
+def tracked_files(root='.'):
+    """Lista os arquivos versionados (caminhos relativos a `root`); None se não for um repositório git"""
+    try:
+        result = subprocess.run(
+            ['git', 'ls-files', '-z', '--cached'],
+            cwd=root, capture_output=True, timeout=60
+        )
+    except (OSError, subprocess.TimeoutExpired):
+        return None
+    if result.returncode != 0:
+        return None
+    return [path for path in result.stdout.decode('utf-8', errors='replace').split('\0') if path]
@@ -0,0 +1,153 @@
+"""
+Índice estrutural de arquivos Markdown
+Uma única leitura produz títulos, seções (linhas e palavras), links e imagens
+"""
+
+import re
+import unicodedata
+from bisect import bisect_right
+
+_ATX_HEADING = re.compile(r'^ {0,3}(#{1,6})(?:[ \t]+(.*?))?(?:[ \t]+#+)?[ \t]*$')
+_SETEXT_UNDERLINE = re.compile(r'^ {0,3}(=+|-+)[ \t]*$')
+_FENCE = re.compile(r'^ {0,3}(`{3,}|~{3,})')
+_INLINE_CODE = re.compile(r'`[^`]*`')
+_LINK = re.compile(r'(!?)\[((?:[^\[\]]|\[[^\]]*\])*)\]\(\s*<?([^)\s>]*)>?(?:\s+["\'(][^)]*)?\s*\)')
+_REFERENCE_DEFINITION = re.compile(r'^ {0,3}\[([^\]]+)\]:\s*<?(\S+?)>?(?:\s+.*)?$')
+_REFERENCE_USE = re.compile(r'(!?)\[([^\]]*)\]\[([^\]]*)\]')
+_HTML_IMAGE = re.compile(r'<img\s[^>]*?src\s*=\s*["\']([^"\']+)["\']', re.IGNORECASE)
+_WORD = re.compile(r'\w+')
+
+def normalize_title(title):
+    """Normaliza um título para comparação: sem acentos, numeração, pontuação ou emojis"""
+    title = unicodedata.normalize('NFKD', title)
+    title = ''.join(char for char in title if not unicodedata.combining(char)).casefold()
+    words = _WORD.findall(title.replace('_', ' '))
+    while words and words[0].isdigit():
+        words.pop(0)
+    return ' '.join(words)
+
+def slugify(title):
+    """Âncora gerada pelo GitHub para um título"""
+    slug = re.sub(r'[^\w\- ]', '', title.strip().lower())
+    return slug.replace(' ', '-')
+
+def index_markdown(text):
+    """
+    Indexa o Markdown em uma passada
+    Títulos dentro de blocos de código são ignorados; cada seção vai do título
+    até o próximo título de nível igual ou superior
+    """
+    headings = []
+    links = []
+    images = []
+    references = {}
+    reference_uses = []
+    content_lines = []   # (número da linha, palavras) das linhas de texto fora de títulos
+    fence = None
+    previous = ''
+
+    lines = text.splitlines()
+    for number, line in enumerate(lines, start=1):
+        fence_match = _FENCE.match(line)
+        if fence:
+            if fence_match and fence_match.group(1)[0] == fence[0] and len(fence_match.group(1)) >= len(fence):
+                fence = None
+            content_lines.append((number, len(_WORD.findall(line))))
+            previous = ''
+            continue
+        if fence_match:
+            fence = fence_match.group(1)
+            previous = ''
+            continue
+
+        heading = _ATX_HEADING.match(line)
+        setext = _SETEXT_UNDERLINE.match(line) if previous.strip() else None
+        if heading:
+            # Um `#` solto (título vazio) não conta como título nem abre seção
+            title = (heading.group(2) or '').strip()
+            if title:
+                headings.append({'level': len(heading.group(1)), 'title': title, 'line': number})
+            else:
+                content_lines.append((number, 0))
+            previous = ''
+            continue
+        if setext and not (setext.group(1)[0] == '-' and previous.lstrip().startswith(('-', '*', '+'))):
+            # Sublinhado transforma a linha anterior em título
+            content_lines.pop()
+            headings.append({'level': 1 if setext.group(1)[0] == '=' else 2, 'title': previous.strip(), 'line': number - 1})
+            previous = ''
+            continue
+
+        content_lines.append((number, len(_WORD.findall(line)) if line.strip() else 0))
+        previous = line
+
+        searchable = _INLINE_CODE.sub('', line)
+        definition = _REFERENCE_DEFINITION.match(searchable)
+        if definition:
+            references[definition.group(1).casefold()] = definition.group(2)
+            continue
+        for image, label, target in _LINK.findall(searchable):
+            (images if image else links).append({'target': target, 'text': label, 'line': number})
+        for image, label, reference in _REFERENCE_USE.findall(searchable):
+            reference_uses.append((image, reference or label, label, number))
+        for target in _HTML_IMAGE.findall(searchable):
+            images.append({'target': target, 'text': '', 'line': number})
+
+    for image, reference, label, number in reference_uses:
+        target = references.get(reference.casefold())
+        if target is not None:
+            (images if image else links).append({'target': target, 'text': label, 'line': number})
+
+    _build_sections(headings, content_lines, len(lines))
+    return {
+        'headings': headings,
+        'links': links,
+        'images': images,
+        'lines': sum(1 for _, words in content_lines if words),
+        'words': sum(words for _, words in content_lines),
+    }
+
+def _build_sections(headings, content_lines, total_lines):
+    """Preenche hierarquia, âncora e tamanho (linhas não vazias e palavras) de cada seção"""
+    slugs = {}
+    stack = []
+    for position, heading in enumerate(headings):
+        while stack and headings[stack[-1]]['level'] >= heading['level']:
+            stack.pop()
+        heading['parent'] = stack[-1] if stack else None
+        stack.append(position)
+
+        slug = slugify(heading['title'])
+        count = slugs.get(slug, 0)
+        slugs[slug] = count + 1
+        heading['slug'] = f"{slug}-{count}" if count else slug
+
+        end = total_lines + 1
+        for following in headings[position + 1:]:
+            if following['level'] <= heading['level']:
+                end = following['line']
+                break
+        heading['end_line'] = end - 1
+
+    # Linhas de conteúdo estão em ordem: soma por intervalo com prefixos acumulados
+    line_numbers = [number for number, _ in content_lines]
+    prefix_words = [0]
+    prefix_lines = [0]
+    for _, words in content_lines:
+        prefix_words.append(prefix_words[-1] + words)
+        prefix_lines.append(prefix_lines[-1] + (1 if words else 0))
+
+    for heading in headings:
+        start = bisect_right(line_numbers, heading['line'])
+        end = bisect_right(line_numbers, heading['end_line'])
+        heading['words'] = prefix_words[end] - prefix_words[start]
+        heading['lines'] = prefix_lines[end] - prefix_lines[start]
+
+def find_section(index, title):
+    """Encontra a seção pelo título (aceita `## Título` para exigir o nível)"""
+    level = len(title) - len(title.lstrip('#'))
+    wanted = normalize_title(title.lstrip('#'))
+    for heading in index['headings']:
+        if normalize_title(heading['title']) == wanted and (not level or heading['level'] == level):
+            return heading
+    return None
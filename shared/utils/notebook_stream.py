@@ -0,0 +1,229 @@
+"""
+Leitura incremental de notebooks Jupyter
+Percorre o JSON em blocos, sem carregar o arquivo (nem as saídas embutidas) na memória
+"""
+
+import json
+import re
+
+CHUNK_SIZE = 64 * 1024
+
+# Strings maiores que isso não são guardadas, apenas medidas (ex.: imagens em base64)
+MAX_STRING = 256
+
+_STRING_STOP = re.compile(r'["\\]')
+_LITERAL = re.compile(r'[-+0-9.eE]+|true|false|null')
+_WHITESPACE = ' \t\n\r'
+
+class NotebookStreamError(ValueError):
+    """JSON inválido ou truncado"""
+
+class _JsonReader:
+    """Buffer de leitura que consome o arquivo em blocos"""
+
+    def __init__(self, file, chunk_size):
+        self.file = file
+        self.chunk_size = chunk_size
+        self.buf = ''
+        self.pos = 0
+
+    def fill(self):
+        """Lê mais um bloco, descartando o que já foi consumido"""
+        chunk = self.file.read(self.chunk_size)
+        if not chunk:
+            return False
+        self.buf = self.buf[self.pos:] + chunk
+        self.pos = 0
+        return True
+
+    def peek(self):
+        """Retorna o próximo caractere significativo sem consumi-lo ('' no fim do arquivo)"""
+        while True:
+            while self.pos < len(self.buf) and self.buf[self.pos] in _WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.buf):
+                return self.buf[self.pos]
+            if not self.fill():
+                return ''
+
+    def expect(self, char):
+        if self.peek() != char:
+            raise NotebookStreamError(f"Esperado '{char}' no JSON")
+        self.pos += 1
+
+    def read_string(self, max_string):
+        """Lê uma string JSON; devolve (valor ou None se maior que max_string, tamanho bruto)"""
+        self.expect('"')
+        parts = []
+        kept = 0
+        length = 0
+        while True:
+            match = _STRING_STOP.search(self.buf, self.pos)
+            end = match.start() if match else len(self.buf)
+            segment = self.buf[self.pos:end]
+            length += len(segment)
+            if kept <= max_string:
+                parts.append(segment)
+                kept += len(segment)
+            self.pos = end
+
+            if not match:
+                if not self.fill():
+                    raise NotebookStreamError("String não terminada no JSON")
+                continue
+
+            if self.buf[end] == '"':
+                self.pos = end + 1
+                break
+
+            # Escape: consome a barra e o caractere seguinte
+            while end + 1 >= len(self.buf):
+                if not self.fill():
+                    raise NotebookStreamError("String não terminada no JSON")
+                end = self.pos
+            escape = self.buf[end:end + 2]
+            length += 2
+            if kept <= max_string:
+                parts.append(escape)
+                kept += 2
+            self.pos = end + 2
+
+        if kept > max_string:
+            return None, length
+        return json.loads('"' + ''.join(parts) + '"'), length
+
+    def read_literal(self):
+        """Lê número, true, false ou null"""
+        self.peek()
+        # Garante que true/false/null não fiquem partidos entre dois blocos
+        while len(self.buf) - self.pos < 8 and self.fill():
+            pass
+        while True:
+            match = _LITERAL.match(self.buf, self.pos)
+            if match and match.end() == len(self.buf) and self.fill():
+                continue
+            break
+        if not match:
+            raise NotebookStreamError("Valor inválido no JSON")
+        self.pos = match.end()
+        text = match.group()
+        return json.loads(text), len(text)
+
+def _child(prefix, key):
+    return f"{prefix}.{key}" if prefix else key
+
+def _parse_value(reader, prefix, max_string):
+    char = reader.peek()
+    if char == '{':
+        reader.pos += 1
+        yield prefix, 'start_map', None, 0
+        if reader.peek() == '}':
+            reader.pos += 1
+        else:
+            while True:
+                key, _ = reader.read_string(max_string)
+                yield prefix, 'map_key', key, 0
+                reader.expect(':')
+                yield from _parse_value(reader, _child(prefix, key or ''), max_string)
+                char = reader.peek()
+                reader.pos += 1
+                if char == '}':
+                    break
+                if char != ',':
+                    raise NotebookStreamError("Esperado ',' ou '}' no JSON")
+        yield prefix, 'end_map', None, 0
+
+    elif char == '[':
+        reader.pos += 1
+        yield prefix, 'start_array', None, 0
+        if reader.peek() == ']':
+            reader.pos += 1
+        else:
+            while True:
+                yield from _parse_value(reader, _child(prefix, 'item'), max_string)
+                char = reader.peek()
+                reader.pos += 1
+                if char == ']':
+                    break
+                if char != ',':
+                    raise NotebookStreamError("Esperado ',' ou ']' no JSON")
+        yield prefix, 'end_array', None, 0
+
+    elif char == '"':
+        value, length = reader.read_string(max_string)
+        yield prefix, 'string', value, length
+
+    elif char:
+        value, length = reader.read_literal()
+        event = 'null' if value is None else 'boolean' if isinstance(value, bool) else 'number'
+        yield prefix, event, value, length
+
+    else:
+        raise NotebookStreamError("Fim inesperado do JSON")
+
+def iter_json_events(file, max_string=MAX_STRING, chunk_size=CHUNK_SIZE):
+    """
+    Gera eventos (prefixo, evento, valor, tamanho) no estilo do ijson
+    Elementos de lista aparecem no prefixo como `item` (ex.: `cells.item.cell_type`);
+    strings acima de `max_string` caracteres chegam com valor None, apenas com o tamanho
+    """
+    reader = _JsonReader(file, chunk_size)
+    yield from _parse_value(reader, '', max_string)
+    if reader.peek():
+        raise NotebookStreamError("Conteúdo extra após o JSON")
+
+def scan_notebook(path, chunk_size=CHUNK_SIZE):
+    """Resume um notebook (.ipynb v4) em uma única passada, com memória limitada"""
+    summary = {
+        'code_cells': 0,
+        'markdown_cells': 0,
+        'raw_cells': 0,
+        'executed_cells': 0,
+        'unexecuted_cells': 0,
+        'out_of_order_cells': 0,
+        'error_outputs': 0,
+        'error_names': [],
+        'output_size': 0,
+    }
+    cell = None
+    last_count = 0
+
+    with open(path, 'r', encoding='utf-8') as file:
+        for prefix, event, value, size in iter_json_events(file, chunk_size=chunk_size):
+            if not prefix.startswith('cells.item'):
+                continue
+
+            if prefix == 'cells.item':
+                if event == 'start_map':
+                    cell = {'cell_type': None, 'execution_count': None, 'source_size': 0}
+                elif event == 'end_map':
+                    cell_type = cell['cell_type']
+                    if cell_type in ('code', 'markdown', 'raw'):
+                        summary[f'{cell_type}_cells'] += 1
+                    # Células de código vazias não precisam ter sido executadas
+                    if cell_type == 'code' and cell['source_size']:
+                        count = cell['execution_count']
+                        if count is None:
+                            summary['unexecuted_cells'] += 1
+                        else:
+                            summary['executed_cells'] += 1
+                            if count <= last_count:
+                                summary['out_of_order_cells'] += 1
+                            last_count = count
+                continue
+
+            if prefix == 'cells.item.cell_type' and event == 'string':
+                cell['cell_type'] = value
+            elif prefix == 'cells.item.execution_count' and event == 'number':
+                cell['execution_count'] = value
+            elif prefix in ('cells.item.source', 'cells.item.source.item') and event == 'string':
+                cell['source_size'] += size
+            elif prefix.startswith('cells.item.outputs.item'):
+                summary['output_size'] += size
+                if prefix == 'cells.item.outputs.item.output_type' and value == 'error':
+                    summary['error_outputs'] += 1
+                elif prefix == 'cells.item.outputs.item.ename' and event == 'string':
+                    if len(summary['error_names']) < 5:
+                        summary['error_names'].append(value)
+
+    return summary
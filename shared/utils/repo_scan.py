@@ -0,0 +1,207 @@
+"""
+Varredura do repositório
+Tamanho total, arquivos grandes e detecção de arquivos duplicados
+"""
+
+import hashlib
+import mmap
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor
+
+from shared.utils.ignore_rules import IgnoreMatcher
+
+# Pastas que nunca entram na varredura
+DEFAULT_EXCLUDES = ['.git/']
+
+# Tamanho dos blocos usados no hash (o prefixo separa candidatos antes do hash completo)
+HASH_CHUNK_SIZE = 1024 * 1024
+PARALLEL_CHUNK_SIZE = 16 * 1024 * 1024
+PREFIX_SIZE = 64 * 1024
+
+SIZE_UNITS = {
+    '': 1,
+    'B': 1,
+    'K': 1024,
+    'KB': 1024,
+    'M': 1024 ** 2,
+    'MB': 1024 ** 2,
+    'G': 1024 ** 3,
+    'GB': 1024 ** 3,
+}
+
+def parse_size(value):
+    """Converte tamanhos como `200MB` ou `1.5 GB` para bytes"""
+    if isinstance(value, (int, float)):
+        return int(value)
+
+    match = re.fullmatch(r'\s*([\d.]+)\s*([KMG]?B?)\s*', str(value).upper())
+    if not match:
+        raise ValueError(f"Tamanho inválido: {value}")
+    return int(float(match.group(1)) * SIZE_UNITS[match.group(2)])
+
+def walk_files(root='.', matcher=None, prefix=''):
+    """
+    Lista (caminho relativo, tamanho) de todos os arquivos do repositório
+    Com um IgnoreMatcher, pastas ignoradas são podadas sem serem percorridas
+    e arquivos .gitignore de subpastas são incorporados durante a descida;
+    `prefix` é o caminho de `root` dentro do repositório, usado nos caminhos devolvidos
+    """
+    if matcher is None:
+        matcher = IgnoreMatcher(DEFAULT_EXCLUDES)
+        nested = False
+    else:
+        nested = True
+
+    files = []
+    pending = [(root, prefix.strip('/'))]
+    while pending:
+        current, relative = pending.pop()
+        try:
+            entries = list(os.scandir(current))
+        except OSError:
+            continue
+
+        if nested and relative and any(entry.name == '.gitignore' for entry in entries):
+            matcher.add_gitignore(os.path.join(current, '.gitignore'), relative)
+
+        for entry in entries:
+            path = f"{relative}/{entry.name}" if relative else entry.name
+            try:
+                if entry.is_dir(follow_symlinks=False):
+                    if not matcher.matches(path, is_dir=True):
+                        pending.append((entry.path, path))
+                elif entry.is_file(follow_symlinks=False):
+                    if not matcher.matches(path):
+                        files.append((path, entry.stat(follow_symlinks=False).st_size))
+            except OSError:
+                continue
+
+    files.sort()
+    return files
+
+def find_ignored(root='.', matcher=None):
+    """
+    Lista entradas presentes na árvore que as regras ignoram, como {'path', 'files'}
+    Pastas ignoradas são reportadas inteiras, sem descer nelas
+    """
+    matcher = matcher or IgnoreMatcher(DEFAULT_EXCLUDES)
+    found = []
+    pending = [(root, '')]
+    while pending:
+        current, relative = pending.pop()
+        try:
+            entries = list(os.scandir(current))
+        except OSError:
+            continue
+
+        for entry in entries:
+            if entry.name == '.git':
+                continue
+            path = f"{relative}/{entry.name}" if relative else entry.name
+            try:
+                if entry.is_dir(follow_symlinks=False):
+                    if matcher.matches(path, is_dir=True):
+                        found.append({'path': f"{path}/", 'files': None})
+                    else:
+                        pending.append((entry.path, path))
+                elif matcher.matches(path):
+                    found.append({'path': path, 'files': 1})
+            except OSError:
+                continue
+
+    found.sort(key=lambda entry: entry['path'])
+    return found
+
+def file_sizes(paths, root='.'):
+    """Lista (caminho, tamanho) para caminhos conhecidos, como os arquivos versionados"""
+    files = []
+    for path in paths:
+        try:
+            files.append((path, os.stat(os.path.join(root, path)).st_size))
+        except OSError:
+            continue
+    files.sort()
+    return files
+
+def hash_chunk(path, offset=0, length=None):
+    """Calcula o hash de um trecho do arquivo lendo-o via mmap, em blocos"""
+    digest = hashlib.blake2b(digest_size=20)
+    with open(path, 'rb') as file:
+        size = os.fstat(file.fileno()).st_size
+        end = size if length is None else min(offset + length, size)
+        if end <= offset:
+            return digest.digest()
+
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            with memoryview(mapped) as view:
+                for start in range(offset, end, HASH_CHUNK_SIZE):
+                    digest.update(view[start:min(start + HASH_CHUNK_SIZE, end)])
+    return digest.digest()
+
+def _split_by_hash(groups, sizes, executor, root, limit=None):
+    """
+    Reagrupa cada grupo de candidatos pelo hash, descartando os que ficaram sozinhos
+    Arquivos grandes são divididos em trechos de PARALLEL_CHUNK_SIZE hasheados em paralelo
+    """
+    tasks = []
+    for group in groups:
+        for path in group:
+            end = sizes[path] if limit is None else min(limit, sizes[path])
+            for offset in range(0, max(end, 1), PARALLEL_CHUNK_SIZE):
+                tasks.append((path, offset, min(PARALLEL_CHUNK_SIZE, end - offset)))
+
+    def safe_hash(task):
+        path, offset, length = task
+        try:
+            return hash_chunk(os.path.join(root, path), offset, length)
+        except (OSError, ValueError):
+            return None
+
+    chunks = {}
+    for (path, _, _), chunk_digest in zip(tasks, executor.map(safe_hash, tasks)):
+        chunks.setdefault(path, []).append(chunk_digest)
+
+    result = []
+    for group in groups:
+        buckets = {}
+        for path in group:
+            if None in chunks[path]:
+                continue
+            key = hashlib.blake2b(b''.join(chunks[path]), digest_size=20).hexdigest()
+            buckets.setdefault(key, []).append(path)
+        result.extend(bucket for bucket in buckets.values() if len(bucket) > 1)
+    return result
+
+def find_duplicates(files, root='.', min_size=1, workers=None):
+    """
+    Encontra arquivos com conteúdo idêntico
+    Agrupa por tamanho primeiro, então só arquivos com tamanho repetido são lidos;
+    o hash do prefixo elimina a maioria dos candidatos antes do hash completo, feito em paralelo
+    """
+    by_size = {}
+    for path, size in files:
+        if size >= max(min_size, 1):
+            by_size.setdefault(size, []).append(path)
+
+    candidates = {size: paths for size, paths in by_size.items() if len(paths) > 1}
+    if not candidates:
+        return []
+
+    sizes = dict(files)
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        small = [paths for size, paths in candidates.items() if size <= PREFIX_SIZE]
+        large = [paths for size, paths in candidates.items() if size > PREFIX_SIZE]
+
+        groups = _split_by_hash(small, sizes, executor, root)
+        if large:
+            prefixed = _split_by_hash(large, sizes, executor, root, PREFIX_SIZE)
+            groups += _split_by_hash(prefixed, sizes, executor, root)
+
+    duplicates = [
+        {'size': sizes[group[0]], 'files': sorted(group)}
+        for group in groups
+    ]
+    # Maior desperdício primeiro
+    duplicates.sort(key=lambda d: (-d['size'] * (len(d['files']) - 1), d['files'][0]))
+    return duplicates
@@ -0,0 +1,129 @@
+"""
+Escalonamento das verificações pelo caminho crítico
+Entre as verificações prontas, começa primeiro a que tem a cadeia mais longa pela frente
+(ela mesma mais as que dependem dela); sem histórico, usa custos estimados por tipo
+"""
+
+import heapq
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+# Custo estimado em segundos quando não há histórico: scripts > HTTP > leitura de conteúdo > stat
+COST_HEURISTICS = {
+    'script': 30.0,
+    'http': 2.0,
+    'content': 0.2,
+    'stat': 0.01,
+}
+
+# Abaixo disso (segundos previstos) a verificação é barata: leitura de conteúdo e stat
+CHEAP_THRESHOLD = 1.0
+
+def cost_category(node):
+    """Categoria de custo de uma verificação do grafo"""
+    if node['type'] == 'script':
+        return 'script'
+    if node['type'] == 'api':
+        return 'http'
+    if node['type'] == 'repository' or node['config'].get('validations'):
+        return 'content'
+    return 'stat'
+
+def estimate_durations(nodes, history):
+    """Duração prevista de cada verificação: média do histórico ou custo estimado pelo tipo"""
+    return {
+        node['id']: history.estimate('checks', node['id'], COST_HEURISTICS[cost_category(node)])
+        for node in nodes
+    }
+
+def _dependents(nodes):
+    dependents = {node['id']: [] for node in nodes}
+    for node in nodes:
+        for required_id in node['requires']:
+            if required_id in dependents:
+                dependents[required_id].append(node['id'])
+    return dependents
+
+def upward_ranks(nodes, durations):
+    """Prioridade: duração da verificação mais a da cadeia mais longa de dependentes (nós em ordem topológica)"""
+    dependents = _dependents(nodes)
+    ranks = {}
+    for node in reversed(nodes):
+        longest = max((ranks[dependent] for dependent in dependents[node['id']]), default=0.0)
+        ranks[node['id']] = durations[node['id']] + longest
+    return ranks
+
+def cheap_first_ranks(nodes, durations, ranks, threshold=CHEAP_THRESHOLD):
+    """
+    Com prazo, as verificações baratas vêm antes de todas as caras (um script lento não consome o prazo
+    delas); dentro de cada grupo continua a ordem de `ranks`
+    """
+    boost = sum(durations.values()) + 1.0
+    return {
+        node['id']: ranks[node['id']] + (boost if durations[node['id']] < threshold else 0.0)
+        for node in nodes
+    }
+
+def cheapest_first_ranks(nodes, durations):
+    """Prioridade invertida para fail-fast: as verificações mais baratas rodam antes e acham a falha cedo"""
+    return {node['id']: -durations[node['id']] for node in nodes}
+
+def critical_path(nodes, durations):
+    """Cadeia de dependências com a maior soma de durações (nós em ordem topológica)"""
+    finish = {}
+    previous = {}
+    for node in nodes:
+        start, after = 0.0, None
+        for required_id in node['requires']:
+            if finish.get(required_id, -1.0) > start:
+                start, after = finish[required_id], required_id
+        finish[node['id']] = start + durations.get(node['id'], 0.0)
+        previous[node['id']] = after
+
+    if not finish:
+        return {'seconds': 0.0, 'checks': []}
+    last = max(finish, key=finish.get)
+    seconds = finish[last]
+    path = []
+    while last is not None:
+        path.append(last)
+        last = previous[last]
+    return {'seconds': round(seconds, 3), 'checks': path[::-1]}
+
+def run_longest_first(nodes, ranks, workers, prepare, execute, finish):
+    """
+    Executa os nós em um pool de `workers` threads, respeitando as dependências
+    `prepare(nó)` devolve um resultado para nós que não precisam rodar (ou None); `execute(nó)` roda no pool;
+    `prepare` e `finish(nó, resultado)` rodam sempre na thread principal
+    """
+    position = {node['id']: index for index, node in enumerate(nodes)}
+    by_id = {node['id']: node for node in nodes}
+    dependents = _dependents(nodes)
+    pending = {node['id']: sum(1 for r in node['requires'] if r in position) for node in nodes}
+    ready = [(-ranks[node_id], position[node_id], node_id) for node_id, count in pending.items() if count == 0]
+    heapq.heapify(ready)
+
+    def release(node_id):
+        for dependent in dependents[node_id]:
+            pending[dependent] -= 1
+            if pending[dependent] == 0:
+                heapq.heappush(ready, (-ranks[dependent], position[dependent], dependent))
+
+    workers = max(1, workers)
+    running = {}
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        while ready or running:
+            while ready and len(running) < workers:
+                node = by_id[heapq.heappop(ready)[2]]
+                result = prepare(node)
+                if result is not None:
+                    finish(node, result)
+                    release(node['id'])
+                else:
+                    running[pool.submit(execute, node)] = node
+
+            if running:
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in sorted(done, key=lambda f: position[running[f]['id']]):
+                    node = running.pop(future)
+                    finish(node, future.result())
+                    release(node['id'])
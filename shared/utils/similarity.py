@@ -0,0 +1,211 @@
+"""
+Detecção de código quase duplicado entre entregas
+Shingles de tokens + MinHash + LSH, com índice persistente em SQLite
+"""
+
+import hashlib
+import os
+import re
+import sqlite3
+import zlib
+from array import array
+
+from shared.utils.ignore_rules import load_matcher
+from shared.utils.repo_scan import walk_files
+
+SOURCE_EXTENSIONS = {
+    '.py', '.js', '.jsx', '.ts', '.tsx', '.java', '.kt', '.c', '.h', '.cpp', '.cs',
+    '.go', '.rb', '.php', '.swift', '.dart', '.html', '.css', '.scss', '.sql', '.vue',
+}
+
+SHINGLE_SIZE = 5
+NUM_HASHES = 128
+BANDS = 32
+ROWS = NUM_HASHES // BANDS
+MIN_SHINGLES = 30
+MAX_FILE_SIZE = 1024 * 1024
+
+_TOKEN = re.compile(r'[A-Za-z_]\w*|\d+|\S')
+_COMMENT = re.compile(r'^\s*(#|//|/\*|\*|<!--)')
+_MASK64 = (1 << 64) - 1
+_BIN_BITS = NUM_HASHES.bit_length() - 1
+_VALUE_MASK = (1 << (64 - _BIN_BITS)) - 1
+
+def tokenize(text):
+    """Quebra o código em tokens, ignorando linhas de comentário e maiúsculas/minúsculas"""
+    tokens = []
+    for line in text.splitlines():
+        if not _COMMENT.match(line):
+            tokens.extend(_TOKEN.findall(line.lower()))
+    return tokens
+
+def shingle_hashes(tokens, size=SHINGLE_SIZE):
+    """Conjunto de hashes de 32 bits das sequências de `size` tokens"""
+    return {
+        zlib.crc32(' '.join(tokens[i:i + size]).encode('utf-8'))
+        for i in range(max(len(tokens) - size + 1, 0))
+    }
+
+def minhash_signature(shingles):
+    """
+    Assinatura MinHash de NUM_HASHES posições com uma única permutação
+    Cada shingle é embaralhado uma vez e cai em uma posição; posições vazias
+    copiam a vizinha à direita (densificação), mantendo a estimativa de Jaccard
+    """
+    signature = [None] * NUM_HASHES
+    for shingle in shingles:
+        mixed = (shingle * 0x9E3779B97F4A7C15 + 0x632BE59BD9B4E019) & _MASK64
+        position = mixed >> (64 - _BIN_BITS)
+        value = mixed & _VALUE_MASK
+        if signature[position] is None or value < signature[position]:
+            signature[position] = value
+
+    if all(value is None for value in signature):
+        return [0] * NUM_HASHES
+
+    dense = []
+    for position in range(NUM_HASHES):
+        distance = 0
+        while signature[(position + distance) % NUM_HASHES] is None:
+            distance += 1
+        dense.append((signature[(position + distance) % NUM_HASHES] + distance * 0x5BD1E995) & _MASK64)
+    return dense
+
+def band_hashes(signature):
+    """Hash de cada banda da assinatura, usado como chave dos baldes LSH"""
+    hashes = []
+    for band in range(BANDS):
+        rows = array('Q', signature[band * ROWS:(band + 1) * ROWS]).tobytes()
+        digest = hashlib.blake2b(rows, digest_size=8, person=band.to_bytes(2, 'big')).digest()
+        hashes.append(int.from_bytes(digest, 'big', signed=True))
+    return hashes
+
+def jaccard(a, b):
+    """Similaridade de Jaccard entre dois conjuntos"""
+    if not a and not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+def source_files(root, src_dir='src', ignore=None):
+    """Lista os arquivos de código de um repositório, respeitando o .gitignore e os padrões padrão"""
+    matcher = load_matcher(root, ignore)
+    return [
+        (path, size)
+        for path, size in walk_files(os.path.join(root, src_dir), matcher, prefix=src_dir)
+        if os.path.splitext(path)[1].lower() in SOURCE_EXTENSIONS and size <= MAX_FILE_SIZE
+    ]
+
+def fingerprint_file(path):
+    """Calcula shingles e assinatura de um arquivo (None se for pequeno demais)"""
+    with open(path, 'r', encoding='utf-8', errors='ignore') as file:
+        shingles = shingle_hashes(tokenize(file.read()))
+    if len(shingles) < MIN_SHINGLES:
+        return None
+    return shingles, minhash_signature(shingles)
+
+class SimilarityIndex:
+    """Índice persistente de impressões digitais de código, atualizado entrega a entrega"""
+
+    def __init__(self, db_path):
+        self.db = sqlite3.connect(db_path)
+        self.db.executescript("""
+            CREATE TABLE IF NOT EXISTS files (
+                id INTEGER PRIMARY KEY,
+                repo TEXT NOT NULL,
+                path TEXT NOT NULL,
+                shingles BLOB NOT NULL,
+                UNIQUE (repo, path)
+            );
+            CREATE TABLE IF NOT EXISTS buckets (
+                band INTEGER NOT NULL,
+                hash INTEGER NOT NULL,
+                file_id INTEGER NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS buckets_lookup ON buckets (band, hash);
+            CREATE INDEX IF NOT EXISTS buckets_file ON buckets (file_id);
+        """)
+
+    def close(self):
+        self.db.close()
+
+    def repositories(self):
+        """Repositórios já indexados"""
+        return [row[0] for row in self.db.execute("SELECT DISTINCT repo FROM files ORDER BY repo")]
+
+    def remove_repository(self, repo):
+        """Remove um repositório do índice (ex.: antes de reindexar uma nova entrega)"""
+        ids = [row[0] for row in self.db.execute("SELECT id FROM files WHERE repo = ?", (repo,))]
+        self.db.executemany("DELETE FROM buckets WHERE file_id = ?", [(i,) for i in ids])
+        self.db.execute("DELETE FROM files WHERE repo = ?", (repo,))
+
+    def add_repository(self, repo, root, src_dir='src'):
+        """Indexa os arquivos de código de um repositório; devolve quantos foram indexados"""
+        self.remove_repository(repo)
+        indexed = 0
+        for path, _ in source_files(root, src_dir):
+            try:
+                fingerprint = fingerprint_file(os.path.join(root, path))
+            except OSError:
+                continue
+            if fingerprint is None:
+                continue
+
+            shingles, signature = fingerprint
+            cursor = self.db.execute(
+                "INSERT INTO files (repo, path, shingles) VALUES (?, ?, ?)",
+                (repo, path, array('I', sorted(shingles)).tobytes())
+            )
+            self.db.executemany(
+                "INSERT INTO buckets (band, hash, file_id) VALUES (?, ?, ?)",
+                [(band, value, cursor.lastrowid) for band, value in enumerate(band_hashes(signature))]
+            )
+            indexed += 1
+        self.db.commit()
+        return indexed
+
+    def _shingles(self, file_id, cache):
+        if file_id not in cache:
+            blob = self.db.execute("SELECT shingles FROM files WHERE id = ?", (file_id,)).fetchone()[0]
+            cache[file_id] = set(array('I', blob))
+        return cache[file_id]
+
+    def similar_pairs(self, threshold=0.8, repos=None):
+        """
+        Pares de arquivos de repositórios diferentes com similaridade >= threshold
+        Só pares que caem no mesmo balde LSH são comparados de forma exata;
+        `repos` restringe aos pares que envolvem esses repositórios (verificação incremental)
+        """
+        query = """
+            SELECT DISTINCT a.file_id, b.file_id
+            FROM buckets a
+            JOIN buckets b ON a.band = b.band AND a.hash = b.hash AND a.file_id < b.file_id
+            JOIN files fa ON fa.id = a.file_id
+            JOIN files fb ON fb.id = b.file_id
+            WHERE fa.repo != fb.repo
+        """
+        params = []
+        if repos:
+            marks = ','.join('?' * len(repos))
+            query += f" AND (fa.repo IN ({marks}) OR fb.repo IN ({marks}))"
+            params = list(repos) * 2
+
+        names = {}
+        cache = {}
+        pairs = []
+        for id_a, id_b in self.db.execute(query, params).fetchall():
+            score = jaccard(self._shingles(id_a, cache), self._shingles(id_b, cache))
+            if score < threshold:
+                continue
+            for file_id in (id_a, id_b):
+                if file_id not in names:
+                    names[file_id] = self.db.execute("SELECT repo, path FROM files WHERE id = ?", (file_id,)).fetchone()
+            pairs.append({
+                'repo_a': names[id_a][0],
+                'file_a': names[id_a][1],
+                'repo_b': names[id_b][0],
+                'file_b': names[id_b][1],
+                'similarity': round(score, 3),
+            })
+
+        pairs.sort(key=lambda p: (-p['similarity'], p['repo_a'], p['file_a'], p['repo_b'], p['file_b']))
+        return pairs
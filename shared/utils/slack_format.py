@@ -33,7 +33,7 @@ def format_message(results):
                         details_lines.append(line)
                         continue
                     
-                    if not in_details and ("Total:" in line or "✅" in line or "❌" in line or "📈" in line or "=" in line):
+                    if not in_details and ("Total:" in line or "✅" in line or "❌" in line or "⏭️" in line or "⏱️" in line or "📈" in line or "=" in line):
                         summary_lines.append(line)
                     elif in_details and len(details_lines) < 10:  # Limita detalhes
                         details_lines.append(line)
@@ -3,7 +3,6 @@ Gerador de Configurações de Validação
 Permite criar configurações via interface programática
 """
 
-import yaml
 import json
 from typing import Dict, List, Any
 from pathlib import Path
@@ -19,7 +18,8 @@ class ValidationConfigBuilder:
                 'folders': [],
                 'files': [],
                 'api_checks': [],
-                'custom_scripts': []
+                'custom_scripts': [],
+                'repository_checks': []
             },
             'notification': {
                 'slack': {
@@ -28,20 +28,29 @@ class ValidationConfigBuilder:
                     'mention_on_failure': False,
                     'users_to_mention': []
                 }
+            },
+            'execution': {
+                'fail_fast': False
             }
         }
     
-    def add_folder_check(self, path: str, required: bool = True, description: str = ""):
+    def add_folder_check(self, path: str, required: bool = True, description: str = "",
+                         requires: List[str] = None):
         """Adiciona verificação de pasta"""
         folder_check = {
             'path': path,
             'required': required,
             'description': description or f'Pasta {path}'
         }
+        
+        if requires:
+            folder_check['requires'] = requires
+            
         self.config['validations']['folders'].append(folder_check)
         return self
     
-    def add_file_check(self, path: str, required: bool = True, description: str = "", validations: List[Dict] = None):
+    def add_file_check(self, path: str, required: bool = True, description: str = "", validations: List[Dict] = None,
+                       requires: List[str] = None):
         """Adiciona verificação de arquivo"""
         file_check = {
             'path': path,
@@ -51,6 +60,9 @@ class ValidationConfigBuilder:
         
         if validations:
             file_check['validations'] = validations
+        
+        if requires:
+            file_check['requires'] = requires
             
         self.config['validations']['files'].append(file_check)
         return self
@@ -64,7 +76,7 @@ class ValidationConfigBuilder:
         }
     
     def add_api_check(self, url: str, method: str = 'GET', required: bool = True, 
-                     expected_status: int = 200, description: str = ""):
+                     expected_status: int = 200, description: str = "", requires: List[str] = None):
         """Adiciona verificação de API"""
         api_check = {
             'url': url,
@@ -73,10 +85,15 @@ class ValidationConfigBuilder:
             'expected_status': expected_status,
             'description': description or f'API {url}'
         }
+        
+        if requires:
+            api_check['requires'] = requires
+            
         self.config['validations']['api_checks'].append(api_check)
         return self
     
-    def add_custom_script(self, name: str, script: str, required: bool = True, description: str = ""):
+    def add_custom_script(self, name: str, script: str, required: bool = True, description: str = "",
+                          requires: List[str] = None):
         """Adiciona script personalizado"""
         script_check = {
             'name': name,
@@ -84,9 +101,29 @@ class ValidationConfigBuilder:
             'required': required,
             'description': description or f'Script {name}'
         }
+        
+        if requires:
+            script_check['requires'] = requires
+            
         self.config['validations']['custom_scripts'].append(script_check)
         return self
     
+    def add_repository_check(self, check_type: str, value: Any = None, required: bool = True,
+                             description: str = "", **options):
+        """Adiciona verificação do repositório (max_repo_size, max_file_size, no_duplicate_files, no_ignored_files)"""
+        repository_check = {
+            'type': check_type,
+            'required': required,
+            'description': description or f'Verificação {check_type}'
+        }
+        
+        if value is not None:
+            repository_check['value'] = value
+        repository_check.update(options)
+            
+        self.config['validations']['repository_checks'].append(repository_check)
+        return self
+    
     def configure_slack(self, channel: str, enabled: bool = True, mention_on_failure: bool = True,
                        users_to_mention: List[str] = None):
         """Configura notificações do Slack"""
@@ -98,8 +135,30 @@ class ValidationConfigBuilder:
         }
         return self
     
+    def configure_execution(self, fail_fast: bool = False, ignore: List[str] = None,
+                            timeout: float = None, stage_timeouts: Dict[str, float] = None,
+                            workers: int = None):
+        """Configura a execução das verificações (ignore substitui os padrões ignorados por padrão)"""
+        self.config['execution']['fail_fast'] = fail_fast
+        
+        if ignore is not None:
+            self.config['execution']['ignore'] = ignore
+        
+        # Prazo total e orçamentos por tipo de verificação (folder, file, api, script, repository), em segundos
+        if timeout is not None:
+            self.config['execution']['timeout'] = timeout
+        if stage_timeouts:
+            self.config['execution']['stage_timeouts'] = stage_timeouts
+        
+        # Verificações independentes executadas em paralelo (as mais demoradas primeiro)
+        if workers is not None:
+            self.config['execution']['workers'] = workers
+            
+        return self
+    
     def to_yaml(self) -> str:
         """Converte configuração para YAML"""
+        import yaml  # Só é necessário para gerar YAML; a validação roda sem PyYAML
         return yaml.dump(self.config, default_flow_style=False, allow_unicode=True, sort_keys=False)
     
     def to_dict(self) -> Dict:
@@ -111,7 +170,7 @@ class ValidationConfigBuilder:
         Path(file_path).parent.mkdir(parents=True, exist_ok=True)
         
         with open(file_path, 'w', encoding='utf-8') as file:
-            yaml.dump(self.config, file, default_flow_style=False, allow_unicode=True, sort_keys=False)
+            file.write(self.to_yaml())
         
         return file_path
 
@@ -136,9 +195,11 @@ class ValidationTemplates:
         
         # Arquivos essenciais
         readme_validations = [
-            builder.add_content_validation("content_contains", "# ", "Deve conter título principal"),
+            builder.add_content_validation("min_headings", 1, "Deve conter título principal"),
             builder.add_content_validation("min_lines", 20, "Deve ter pelo menos 20 linhas"),
-            builder.add_content_validation("content_contains", "## Instalação", "Deve conter seção de instalação")
+            builder.add_content_validation("required_sections", ["Instalação"], "Deve conter seção de instalação"),
+            builder.add_content_validation("no_broken_links", True, "Links relativos válidos"),
+            builder.add_content_validation("no_missing_images", True, "Imagens presentes")
         ]
         builder.add_file_check("README.md", True, "README principal", readme_validations)
         builder.add_file_check(".gitignore", True, "Arquivo gitignore")
@@ -153,6 +214,11 @@ class ValidationTemplates:
         builder.add_custom_script("lint_python", "flake8 src/", False, "Lint do código Python")
         builder.add_custom_script("test_backend", "python -m pytest tests/", False, "Testes do backend")
         
+        # Tamanho do repositório
+        builder.add_repository_check("max_file_size", "10MB", False, "Sem arquivos grandes (node_modules, builds)")
+        builder.add_repository_check("no_ignored_files", required=False,
+                                     description="Sem node_modules, .venv ou .env versionados")
+        
         # Configurar Slack
         builder.configure_slack("#entregas", True, True, ["@professor"])
         
@@ -171,8 +237,8 @@ class ValidationTemplates:
         builder.add_folder_check("docs", True, "Documentação")
         
         readme_validations = [
-            builder.add_content_validation("content_contains", "# ", "Deve conter título"),
-            builder.add_content_validation("content_contains", "## Como executar", "Instruções de execução"),
+            builder.add_content_validation("min_headings", 1, "Deve conter título"),
+            builder.add_content_validation("required_sections", ["Como executar"], "Instruções de execução"),
             builder.add_content_validation("min_lines", 15, "Pelo menos 15 linhas")
         ]
         builder.add_file_check("README.md", True, "README principal", readme_validations)
@@ -196,7 +262,18 @@ class ValidationTemplates:
         
         builder.add_file_check("README.md", True, "Documentação principal")
         builder.add_file_check("requirements.txt", True, "Dependências Python")
-        builder.add_file_check("notebooks/analise_exploratoria.ipynb", False, "Análise exploratória")
+        notebook_validations = [
+            builder.add_content_validation("min_markdown_cells", 3, "Análise explicada em texto"),
+            builder.add_content_validation("min_code_cells", 5, "Pelo menos 5 células de código"),
+            builder.add_content_validation("executed_in_order", True, "Todas as células executadas em ordem"),
+            builder.add_content_validation("no_error_outputs", True, "Sem erros nas saídas"),
+            builder.add_content_validation("max_output_size", "10MB", "Saídas com tamanho razoável")
+        ]
+        builder.add_file_check("notebooks/analise_exploratoria.ipynb", False, "Análise exploratória", notebook_validations)
+        
+        builder.add_repository_check("max_repo_size", "500MB", False, "Repositório com tamanho razoável")
+        builder.add_repository_check("max_file_size", "100MB", False, "Sem datasets ou pesos de modelo gigantes versionados")
+        builder.add_repository_check("no_duplicate_files", required=False, description="Sem datasets duplicados", min_size="1MB")
         
         builder.add_custom_script("check_datasets", "python -c 'import pandas as pd; print(\"Datasets OK\")'", False, "Verificar datasets")
         